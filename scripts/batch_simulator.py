@@ -0,0 +1,748 @@
+#!/usr/bin/env python3
+"""
+Batch Simulator - Headless Quantum Resonance games at scale
+===========================================================
+Plays many games between chosen factions and decks with pluggable
+policies, without printing or event emission, and aggregates win rates,
+final score distributions and turn counts.
+
+A policy is any callable policy(engine) -> List[Card] that picks the cards
+to play in the current player's main phase; POLICIES names the built-in
+ones. Policies that need randomness draw from engine.rng. Every game gets
+its own engine seeded from (batch seed, game index), so a batch is
+reproducible and any single game can be replayed.
+
+`batch_simulator.py tournament` plays a round robin between faction/deck
+entrants over a process pool and prints a win-rate matrix.
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from game_engine import (
+    CARD_IDS, COUPLING_TABLE_ENV, FACTIONS, Card, GameEngine, Player, TurnPhase, cards_for_mask,
+    create_card, get_coupling_network, use_coupling_table
+)
+
+# Prebuilt deck files (one tournament entrant per faction and deck)
+PREBUILT_DECKS_DIR = Path(__file__).resolve().parent.parent / 'data' / 'prebuilt_decks'
+
+Policy = Callable[[GameEngine], List[Card]]
+
+
+# =============================================================================
+# POLICIES
+# =============================================================================
+
+def play_first_three(engine: GameEngine) -> List[Card]:
+    """The CLI's policy: the first three cards in hand."""
+    return engine.state.current_player.hand[:3]
+
+
+def play_highest_ranks(engine: GameEngine) -> List[Card]:
+    """The three highest-ranked playable cards."""
+    locked = engine.state.game_field.locked_cards
+    playable = [c for c in engine.state.current_player.hand if c.card_id not in locked]
+    return sorted(playable, key=lambda c: -c.rank)[:3]
+
+
+def play_random(engine: GameEngine) -> List[Card]:
+    """A uniformly random legal formation."""
+    masks = engine.valid_play_masks()
+    if not masks:
+        return []
+    return cards_for_mask(engine.state.current_player.hand, engine.rng.choice(masks))
+
+
+def play_best(engine: GameEngine) -> List[Card]:
+    """The highest-scoring legal formation this turn."""
+    best = engine.score_plays(top_k=1)
+    if not best:
+        return []
+    return cards_for_mask(engine.state.current_player.hand, best[0].mask)
+
+
+POLICIES: Dict[str, Policy] = {
+    'first3': play_first_three,
+    'highest': play_highest_ranks,
+    'random': play_random,
+    'best': play_best,
+}
+
+
+def get_policy(policy) -> Policy:
+    """A policy callable, looked up by name if given as a string."""
+    if callable(policy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy} (choose from {', '.join(POLICIES)})")
+    return POLICIES[policy]
+
+
+def capped_policy(policy, max_cards: Optional[int]) -> Policy:
+    """
+    A policy restricted to formations of at most max_cards cards (the
+    policy itself if max_cards is None). 'best' and 'random' choose among
+    the capped formations; other policies keep their first max_cards cards.
+    """
+    policy = get_policy(policy)
+    if max_cards is None:
+        return policy
+    if max_cards < 1:
+        raise ValueError("max_cards must be at least 1")
+
+    if policy is play_best:
+        def capped(engine: GameEngine) -> List[Card]:
+            best = engine.score_plays(top_k=1, max_cards=max_cards)
+            if not best:
+                return []
+            return cards_for_mask(engine.state.current_player.hand, best[0].mask)
+    elif policy is play_random:
+        def capped(engine: GameEngine) -> List[Card]:
+            masks = [m for m in engine.valid_play_masks() if bin(m).count('1') <= max_cards]
+            if not masks:
+                return []
+            return cards_for_mask(engine.state.current_player.hand, engine.rng.choice(masks))
+    else:
+        def capped(engine: GameEngine) -> List[Card]:
+            return list(policy(engine))[:max_cards]
+
+    name = next((key for key, fn in POLICIES.items() if fn is policy),
+                getattr(policy, '__name__', 'policy'))
+    capped.__name__ = f"{name}<={max_cards}"
+    return capped
+
+
+# =============================================================================
+# GAMES
+# =============================================================================
+
+@dataclass
+class GameResult:
+    """Outcome of one game; winner is a seat index, None on timeout."""
+    winner: Optional[int]
+    scores: List[int]
+    turns: int
+
+
+def play_turn(engine: GameEngine, cards: List[Card]) -> Optional[Player]:
+    """
+    Finish the current player's turn from the main phase with cards as the
+    formation: score, discard down to the hand limit and end the turn.
+    Returns the winner, if any.
+    """
+    state = engine.state
+    if not engine.play_cards(cards):
+        raise ValueError(f"Seat {state.current_player_idx} chose an illegal play")
+    state.advance_phase()
+    engine.calculate_score()
+    state.advance_phase()
+    engine.enforce_hand_limit()
+    state.advance_phase()
+    return engine.end_turn()
+
+
+def play_game(factions: Sequence[str], policies: Sequence[Policy],
+              decks: Optional[List[List[str]]] = None,
+              max_turns: int = 50, seed: Optional[int] = None) -> GameResult:
+    """
+    Play one headless game, one seat per faction.
+
+    Follows the same turn loop as game_engine.main: draw, play, score,
+    discard, end turn, until someone reaches the win score or max_turns
+    turns have been played. The engine's generator is seeded with seed
+    (fresh entropy if None), so a seeded game always plays out the same.
+    """
+    if len(policies) != len(factions):
+        raise ValueError("Must have one policy per faction")
+
+    engine = GameEngine(emit_events=False, rng=random.Random(seed))
+    engine.setup([f"Player {i + 1}" for i in range(len(factions))], list(factions), decks)
+    state = engine.state
+
+    while True:
+        player_idx = state.current_player_idx
+        if state.phase == TurnPhase.DRAW:
+            engine.execute_draw()
+
+        winner = play_turn(engine, policies[player_idx](engine))
+        turns = state.turn_number - 1
+        if winner or turns >= max_turns:
+            return GameResult(
+                winner=state.players.index(winner) if winner else None,
+                scores=[p.score for p in state.players],
+                turns=turns,
+            )
+
+
+# =============================================================================
+# BATCH STATISTICS
+# =============================================================================
+
+@dataclass
+class BatchStats:
+    """
+    Aggregated results of a batch: wins per seat, timeouts, per-seat final
+    score histograms and a turn count histogram. Batches over the same
+    seats can be combined with merge().
+    """
+    factions: List[str]
+    policies: List[str]
+    games: int = 0
+    timeouts: int = 0
+    wins: List[int] = field(default_factory=list)
+    scores: List[Counter] = field(default_factory=list)
+    turns: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    def __post_init__(self):
+        if not self.wins:
+            self.wins = [0] * len(self.factions)
+        if not self.scores:
+            self.scores = [Counter() for _ in self.factions]
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        if result.winner is None:
+            self.timeouts += 1
+        else:
+            self.wins[result.winner] += 1
+        for seat, score in enumerate(result.scores):
+            self.scores[seat][score] += 1
+        self.turns[result.turns] += 1
+
+    def merge(self, other: 'BatchStats') -> None:
+        """Fold another batch over the same seats into this one."""
+        if other.factions != self.factions or other.policies != self.policies:
+            raise ValueError("Can only merge batches over the same seats")
+        self.games += other.games
+        self.timeouts += other.timeouts
+        for seat in range(len(self.factions)):
+            self.wins[seat] += other.wins[seat]
+            self.scores[seat].update(other.scores[seat])
+        self.turns.update(other.turns)
+        self.elapsed += other.elapsed
+
+    def win_rate(self, seat: int) -> float:
+        return self.wins[seat] / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict:
+        """Plain-dict summary (JSON serializable)."""
+        return {
+            'games': self.games,
+            'timeouts': self.timeouts,
+            'elapsed': self.elapsed,
+            'games_per_second': self.games_per_second,
+            'seats': [
+                {
+                    'faction': faction,
+                    'policy': policy,
+                    'wins': self.wins[seat],
+                    'win_rate': self.win_rate(seat),
+                    'score': histogram_stats(self.scores[seat]),
+                }
+                for seat, (faction, policy) in enumerate(zip(self.factions, self.policies))
+            ],
+            'turns': histogram_stats(self.turns),
+        }
+
+
+def histogram_stats(counts: Counter) -> Dict[str, float]:
+    """Mean, standard deviation, min, median, 90th percentile and max of a histogram."""
+    n = sum(counts.values())
+    if not n:
+        return {}
+    mean = sum(value * c for value, c in counts.items()) / n
+    variance = sum((value - mean) ** 2 * c for value, c in counts.items()) / n
+
+    values = sorted(counts)
+
+    def quantile(q: float) -> int:
+        target = q * (n - 1)
+        seen = 0
+        for value in values:
+            seen += counts[value]
+            if seen > target:
+                return value
+        return values[-1]
+
+    return {
+        'mean': mean,
+        'std': math.sqrt(variance),
+        'min': values[0],
+        'p50': quantile(0.5),
+        'p90': quantile(0.9),
+        'max': values[-1],
+    }
+
+
+def simulate(games: int, factions: Sequence[str], policies: Sequence = None,
+             decks: Optional[List[List[str]]] = None, max_turns: int = 50,
+             seed: int = 0) -> BatchStats:
+    """
+    Play games headless games and aggregate them.
+
+    policies are callables or POLICIES names, one per faction (default
+    'first3' for every seat). Game i is seeded from (seed, i), so any
+    batch, or part of one, can be replayed.
+    """
+    if games < 1:
+        raise ValueError("games must be at least 1")
+    for faction in factions:
+        if faction.lower() not in FACTIONS:
+            raise ValueError(f"Unknown faction: {faction}")
+    if policies is None:
+        policies = ['first3'] * len(factions)
+    policy_fns = [get_policy(p) for p in policies]
+
+    stats = BatchStats(
+        factions=list(factions),
+        policies=[p if isinstance(p, str) else getattr(p, '__name__', repr(p))
+                  for p in policies],
+    )
+
+    start = time.perf_counter()
+    for i in range(games):
+        try:
+            stats.add(play_game(factions, policy_fns, decks, max_turns, game_seed(seed, i)))
+        except Exception as e:
+            raise GameFailure(seed, i) from e
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def game_seed(seed: int, game: int) -> int:
+    """
+    Seed of game number game (0 <= game < 2**32) in a batch seeded with
+    seed; distinct (seed, game) pairs never share a seed.
+    """
+    return (seed << 32) + game
+
+
+class GameFailure(RuntimeError):
+    """A game raised; replay it with play_game(..., seed=game_seed(seed, game))."""
+
+    def __init__(self, seed: int, game: int):
+        super().__init__(f"Game {game} of batch seed {seed} failed "
+                         f"(replay with seed=game_seed({seed}, {game}))")
+        self.seed = seed
+        self.game = game
+
+
+# =============================================================================
+# TOURNAMENT
+# =============================================================================
+
+@dataclass(frozen=True)
+class Entrant:
+    """A faction playing a deck; cards is None for the engine's default deck."""
+    name: str
+    faction: str
+    cards: Optional[Tuple[str, ...]] = None
+
+
+def build_entrants(factions: Optional[Sequence[str]] = None,
+                   deck_paths: Optional[Sequence[str]] = None,
+                   native: bool = False) -> List[Entrant]:
+    """
+    Tournament entrants: every faction with every deck (the 'default' deck
+    path means the engine's generated deck). With native=True each deck is
+    only played by the faction named in its file.
+    """
+    from deck_validator import load_deck_file
+
+    factions = [f.lower() for f in (factions or FACTIONS)]
+    for faction in factions:
+        if faction not in FACTIONS:
+            raise ValueError(f"Unknown faction: {faction}")
+    if deck_paths is None:
+        deck_paths = sorted(str(p) for p in PREBUILT_DECKS_DIR.glob('*.json'))
+        if not deck_paths:
+            raise ValueError(f"No deck files in {PREBUILT_DECKS_DIR}")
+
+    entrants = []
+    for path in deck_paths:
+        if path == 'default':
+            entrants.extend(Entrant(f"{faction}/default", faction) for faction in factions)
+            continue
+        cards, deck_faction = load_deck_file(path)
+        for faction in factions:
+            if native and faction != deck_faction.lower():
+                continue
+            entrants.append(Entrant(f"{faction}/{Path(path).stem}", faction, tuple(cards)))
+    if not entrants:
+        raise ValueError("No entrants")
+    return entrants
+
+
+@dataclass
+class TournamentResult:
+    """
+    Round-robin outcome. wins[i][j] counts games entrant i won against j and
+    draws[i][j] timeouts between them (symmetric); games[i][j] is the number
+    played. first_wins counts wins by the seat that moved first. In a mirror
+    match (i == j) both seats are the same entrant, so wins[i][i] counts
+    the first seat's wins and the diagonal win rate is the first-seat
+    rate of that mirror.
+    """
+    entrants: List[Entrant]
+    wins: List[List[int]]
+    draws: List[List[int]]
+    games: List[List[int]]
+    first_wins: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total_games(self) -> int:
+        n = len(self.entrants)
+        return sum(self.games[i][j] for i in range(n) for j in range(i, n))
+
+    @property
+    def total_draws(self) -> int:
+        n = len(self.entrants)
+        return sum(self.draws[i][j] for i in range(n) for j in range(i, n))
+
+    @property
+    def first_seat_win_rate(self) -> float:
+        """Share of decided games (draws excluded) won by the first seat."""
+        decided = self.total_games - self.total_draws
+        return self.first_wins / decided if decided else 0.0
+
+    def win_rate(self, i: int, j: int) -> float:
+        """
+        Share of i's games against j that i won, counting draws as half
+        (for i == j, the first seat's share of the mirror).
+        """
+        games = self.games[i][j]
+        if not games:
+            return 0.0
+        return (self.wins[i][j] + 0.5 * self.draws[i][j]) / games
+
+    def confidence_interval(self, i: int, j: int, z: float = 1.96) -> Tuple[float, float]:
+        """Wilson score interval for win_rate(i, j) (95% at z = 1.96)."""
+        n = self.games[i][j]
+        if not n:
+            return 0.0, 1.0
+        p = self.win_rate(i, j)
+        denominator = 1 + z * z / n
+        centre = (p + z * z / (2 * n)) / denominator
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+        return max(0.0, centre - half), min(1.0, centre + half)
+
+    def summary(self, z: float = 1.96) -> Dict:
+        """Plain-dict summary (JSON serializable)."""
+        n = len(self.entrants)
+        return {
+            'entrants': [e.name for e in self.entrants],
+            'games': self.games,
+            'win_rate': [[self.win_rate(i, j) for j in range(n)] for i in range(n)],
+            'ci': [[list(self.confidence_interval(i, j, z)) for j in range(n)] for i in range(n)],
+            'z': z,
+            'total_games': self.total_games,
+            'total_draws': self.total_draws,
+            'first_seat_win_rate': self.first_seat_win_rate,
+            'elapsed': self.elapsed,
+        }
+
+
+# Per-worker tournament state, set once by _tournament_worker_init
+_TOURNAMENT: Dict = {}
+
+
+def _tournament_worker_init(entrants: List[Entrant], policy: str, max_turns: int,
+                            coupling_table: Optional[str] = None) -> None:
+    """
+    Set up a worker once: map the shared coupling table (or build the
+    network if none is given) and intern the card prototypes.
+    """
+    if coupling_table:
+        use_coupling_table(coupling_table)
+    else:
+        get_coupling_network()
+    for card_id in CARD_IDS:
+        create_card(card_id)
+    _TOURNAMENT.update(entrants=entrants, policy=get_policy(policy), max_turns=max_turns)
+
+
+def _tournament_run(task: Tuple[int, int, int, int, int]) -> Tuple:
+    """
+    Play one chunk of a matchup: (i, j, first game, games, batch seed).
+    Entrant i moves first in even-numbered games and j in odd ones.
+    Returns (i, j, i wins, j wins, draws, first-seat wins).
+    """
+    i, j, start, games, seed = task
+    entrants = _TOURNAMENT['entrants']
+    policy = _TOURNAMENT['policy']
+    max_turns = _TOURNAMENT['max_turns']
+    a, b = entrants[i], entrants[j]
+
+    a_wins = b_wins = draws = first_wins = 0
+    for game in range(start, start + games):
+        first, second = (a, b) if game % 2 == 0 else (b, a)
+        decks = None
+        if first.cards is not None or second.cards is not None:
+            decks = [list(e.cards) if e.cards is not None else None for e in (first, second)]
+        try:
+            result = play_game((first.faction, second.faction), (policy, policy), decks,
+                               max_turns, game_seed(seed, game))
+        except Exception as e:
+            raise GameFailure(seed, game) from e
+        if result.winner is None:
+            draws += 1
+            continue
+        if result.winner == 0:
+            first_wins += 1
+        if (result.winner == 0) == (game % 2 == 0):
+            a_wins += 1
+        else:
+            b_wins += 1
+    return i, j, a_wins, b_wins, draws, first_wins
+
+
+def run_tournament(entrants: List[Entrant], games: int = 10000, policy: str = 'first3',
+                   max_turns: int = 50, seed: int = 0, workers: Optional[int] = None,
+                   chunk_size: int = 1000, progress: bool = True) -> TournamentResult:
+    """
+    Round robin over every pair of entrants, mirrors included, games per
+    matchup. Matchups are split into chunks of chunk_size games spread over
+    a process pool (run in-process with one worker). Each matchup plays its
+    own game numbers, so results do not depend on the worker count.
+    """
+    if games < 1 or chunk_size < 1:
+        raise ValueError("games and chunk_size must be at least 1")
+    get_policy(policy)
+
+    n = len(entrants)
+    matchups = [(i, j) for i in range(n) for j in range(i, n)]
+    tasks = []
+    for number, (i, j) in enumerate(matchups):
+        for start in range(0, games, chunk_size):
+            tasks.append((i, j, number * games + start, min(chunk_size, games - start), seed))
+
+    result = TournamentResult(
+        entrants=list(entrants),
+        wins=[[0] * n for _ in range(n)],
+        draws=[[0] * n for _ in range(n)],
+        games=[[0] * n for _ in range(n)],
+    )
+    workers = max(1, workers or os.cpu_count() or 1)
+    if progress:
+        print(f"Tournament: {n} entrants, {len(matchups)} matchups x {games} games "
+              f"in {len(tasks)} chunks on {workers} workers")
+
+    def record(chunk) -> None:
+        i, j, a_wins, b_wins, draws, first_wins = chunk
+        played = a_wins + b_wins + draws
+        result.games[i][j] += played
+        result.draws[i][j] += draws
+        result.first_wins += first_wins
+        if i == j:
+            # Which copy of a mirrored entrant won says nothing; its seat does
+            result.wins[i][i] += first_wins
+        else:
+            result.wins[i][j] += a_wins
+            result.wins[j][i] += b_wins
+            result.games[j][i] += played
+            result.draws[j][i] += draws
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        _tournament_worker_init(result.entrants, policy, max_turns)
+        for number, task in enumerate(tasks, 1):
+            record(_tournament_run(task))
+            if progress and number % 50 == 0:
+                print(f"  [{number}/{len(tasks)}]")
+    else:
+        # Workers map one saved coupling table instead of each rebuilding it
+        table_dir = None
+        coupling_table = os.environ.get(COUPLING_TABLE_ENV)
+        if not coupling_table:
+            table_dir = tempfile.TemporaryDirectory(prefix='qr_coupling_')
+            coupling_table = os.path.join(table_dir.name, 'coupling.bin')
+            get_coupling_network().save(coupling_table)
+
+        completed = 0
+        queue = iter(tasks)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_tournament_worker_init,
+                                 initargs=(result.entrants, policy, max_turns,
+                                           coupling_table)) as pool:
+            # Keep a bounded number of chunks in flight
+            in_flight = set()
+            for task in queue:
+                in_flight.add(pool.submit(_tournament_run, task))
+                if len(in_flight) >= workers * 2:
+                    break
+
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record(future.result())
+                    completed += 1
+                    if progress and completed % 50 == 0:
+                        print(f"  [{completed}/{len(tasks)}]")
+
+                    next_task = next(queue, None)
+                    if next_task is not None:
+                        in_flight.add(pool.submit(_tournament_run, next_task))
+        if table_dir is not None:
+            table_dir.cleanup()
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
+
+# =============================================================================
+# CLI INTERFACE
+# =============================================================================
+
+def print_summary(stats: BatchStats) -> None:
+    print(f"{stats.games} games in {stats.elapsed:.2f}s "
+          f"({stats.games_per_second:,.0f} games/s), {stats.timeouts} timeouts")
+    print(f"{'seat':<5} {'faction':<10} {'policy':<10} {'wins':>8} {'win %':>7} "
+          f"{'mean':>7} {'p50':>5} {'p90':>5}")
+    for seat, info in enumerate(stats.summary()['seats']):
+        score = info['score']
+        print(f"{seat + 1:<5} {info['faction']:<10} {info['policy']:<10} "
+              f"{info['wins']:>8} {info['win_rate']:>7.1%} {score['mean']:>7.1f} "
+              f"{score['p50']:>5} {score['p90']:>5}")
+    turns = histogram_stats(stats.turns)
+    print(f"turns: mean {turns['mean']:.1f}, p50 {turns['p50']}, "
+          f"p90 {turns['p90']}, max {turns['max']}")
+
+
+def print_matrix(result: TournamentResult, z: float = 1.96) -> None:
+    """Win-rate matrix (row vs column) with confidence interval half-widths."""
+    names = [e.name for e in result.entrants]
+    width = max(len(name) for name in names)
+    print(f"{result.total_games} games in {result.elapsed:.1f}s "
+          f"({result.total_games / result.elapsed if result.elapsed else 0:,.0f} games/s), "
+          f"first seat wins {result.first_seat_win_rate:.1%} of decided games")
+    print(f"Win rate of row vs column, \u00b1 CI half-width (z = {z}); "
+          f"the diagonal is the first seat's rate in the mirror:")
+    print(' ' * width + ''.join(f" {k + 1:>11}" for k in range(len(names))))
+    for i, name in enumerate(names):
+        cells = []
+        for j in range(len(names)):
+            low, high = result.confidence_interval(i, j, z)
+            cells.append(f" {result.win_rate(i, j):>5.1%}\u00b1{(high - low) / 2:>4.1%}")
+        print(f"{name:<{width}}" + ''.join(cells))
+    for k, name in enumerate(names):
+        print(f"  {k + 1:>2}: {name}")
+
+
+def tournament_main(argv: List[str]) -> int:
+    """CLI entry point for `batch_simulator.py tournament ...`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='batch_simulator.py tournament',
+        description='Round-robin tournament over faction/deck entrants on a process pool',
+    )
+    parser.add_argument('--games', type=int, default=10000, help='Games per matchup')
+    parser.add_argument('--factions', nargs='+', default=None,
+                        help='Factions to enter (default: all)')
+    parser.add_argument('--decks', nargs='+', default=None,
+                        help="Deck JSON files, or 'default' for the generated deck "
+                             "(default: data/prebuilt_decks/*.json)")
+    parser.add_argument('--native', action='store_true',
+                        help="Only play each deck with its own faction")
+    parser.add_argument('--policy', type=str, default='first3',
+                        help=f'Policy for every seat: {", ".join(POLICIES)}')
+    parser.add_argument('--max-turns', type=int, default=50, help='Turn limit per game')
+    parser.add_argument('--seed', type=int, default=0, help='Tournament seed')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help='Games per worker task')
+    parser.add_argument('--z', type=float, default=1.96,
+                        help='Confidence interval z-score (1.96 = 95%%)')
+    parser.add_argument('--json', type=str, default=None, help='Write the results to this file')
+    parser.add_argument('--quiet', action='store_true', help='Suppress progress output')
+
+    args = parser.parse_args(argv)
+
+    try:
+        entrants = build_entrants(args.factions, args.decks, args.native)
+        result = run_tournament(entrants, args.games, args.policy, args.max_turns,
+                                args.seed, args.workers, args.chunk_size,
+                                progress=not args.quiet)
+    except (ValueError, FileNotFoundError) as e:
+        parser.error(str(e))
+
+    print_matrix(result, args.z)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result.summary(args.z), f, indent=2)
+        print(f"Results written to {args.json}")
+    return 0
+
+
+def main():
+    import argparse
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'tournament':
+        return tournament_main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description='Headless batch game simulator')
+    parser.add_argument('--games', type=int, default=1000, help='Number of games')
+    parser.add_argument('--factions', nargs='+', default=None,
+                        help='Faction per seat (default: from --decks, else spades hearts)')
+    parser.add_argument('--decks', nargs='+', default=None,
+                        help='Deck JSON file per seat (see data/prebuilt_decks)')
+    parser.add_argument('--policies', nargs='+', default=None,
+                        help=f'Policy per seat: {", ".join(POLICIES)} (default first3)')
+    parser.add_argument('--max-turns', type=int, default=50, help='Turn limit per game')
+    parser.add_argument('--seed', type=int, default=0, help='Batch seed')
+    parser.add_argument('--json', type=str, default=None, help='Write the summary to this file')
+
+    args = parser.parse_args()
+
+    decks = None
+    factions = args.factions
+    if args.decks:
+        from deck_validator import load_deck_file
+        loaded = [load_deck_file(path) for path in args.decks]
+        decks = [cards for cards, _ in loaded]
+        if factions is None:
+            factions = [faction for _, faction in loaded]
+    if factions is None:
+        factions = ['spades', 'hearts']
+    if decks is not None and len(decks) != len(factions):
+        parser.error("Need one deck per faction")
+
+    policies = args.policies or ['first3'] * len(factions)
+    if len(policies) != len(factions):
+        parser.error("Need one policy per faction")
+
+    try:
+        stats = simulate(args.games, factions, policies, decks, args.max_turns, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print_summary(stats)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(stats.summary(), f, indent=2)
+        print(f"Summary written to {args.json}")
+
+
+if __name__ == '__main__':
+    # Run through the importable module so policies and stats pickle by
+    # their module path rather than __main__
+    import batch_simulator
+    batch_simulator.main()
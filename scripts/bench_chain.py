@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Chain Solver Benchmark
+======================
+Compares the greedy chain bonus (the scoring rule) against the exact
+bitmask-DP solver and a brute-force search over every ordering.
+
+For each formation size it reports the mean time per formation, how often
+greedy misses the optimum, and the mean bonus it leaves on the table.
+"""
+
+import itertools
+import random
+import time
+
+from game_engine import (
+    CARD_IDS, CARD_INDEX, chain_bonus_for_indices, get_coupling_network,
+    optimal_chain
+)
+
+
+def brute_force_chain(indices):
+    """Best chain bonus by trying every ordering of every subset."""
+    weights = get_coupling_network().weights
+    n = len(indices)
+    best = 0
+    for length in range(1, n + 1):
+        for order in itertools.permutations(range(n), length):
+            total = 0
+            for a, b in zip(order, order[1:]):
+                w = weights[indices[a]][indices[b]]
+                if w < 0.4:
+                    break
+                total += int(w * 10)
+            else:
+                if length == n and n >= 3:
+                    total += 15
+                best = max(best, total)
+    return best
+
+
+def time_per_call(fn, formations):
+    """Mean seconds per formation."""
+    start = time.perf_counter()
+    for indices in formations:
+        fn(indices)
+    return (time.perf_counter() - start) / len(formations)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Greedy vs exact chain solver benchmark')
+    parser.add_argument('--samples', type=int, default=500, help='Formations per size')
+    parser.add_argument('--max-size', type=int, default=7, help='Largest formation size')
+    parser.add_argument('--brute-max', type=int, default=6,
+                        help='Largest size to brute-force (n! orderings)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    deck = [CARD_INDEX[card_id] for card_id in CARD_IDS]
+    get_coupling_network()
+
+    print(f"{'n':>2} {'greedy µs':>10} {'exact µs':>10} {'brute µs':>10} "
+          f"{'greedy<opt':>11} {'mean gap':>9}")
+    for n in range(2, args.max_size + 1):
+        formations = [rng.sample(deck, n) for _ in range(args.samples)]
+
+        greedy = [chain_bonus_for_indices(f) for f in formations]
+        exact = [optimal_chain(f)[0] for f in formations]
+        if n <= args.brute_max:
+            brute = [brute_force_chain(f) for f in formations[:100]]
+            if brute != exact[:100]:
+                raise SystemExit(f"exact solver disagrees with brute force at n={n}")
+
+        greedy_us = time_per_call(chain_bonus_for_indices, formations) * 1e6
+        exact_us = time_per_call(optimal_chain, formations) * 1e6
+        if n <= args.brute_max:
+            brute_us = time_per_call(brute_force_chain, formations[:100]) * 1e6
+            brute_col = f"{brute_us:10.1f}"
+        else:
+            brute_col = f"{'-':>10}"
+
+        misses = sum(1 for g, e in zip(greedy, exact) if g < e)
+        gap = sum(e - g for g, e in zip(greedy, exact)) / len(formations)
+        print(f"{n:2d} {greedy_us:10.1f} {exact_us:10.1f} {brute_col} "
+              f"{misses / len(formations):10.1%} {gap:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
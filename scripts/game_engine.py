@@ -10,15 +10,24 @@ Mathematical Foundation:
 - Coupling network for chain bonuses
 """
 
+import heapq
 import json
 import math
+import mmap
+import os
 import random
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Callable
-from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple, Callable
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from itertools import combinations
 from pathlib import Path
 
+# __slots__ for the small value types where dataclasses support it (3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 # Import from generator if available, otherwise define locally
 try:
     from holographic_card_generator import (
@@ -28,7 +37,7 @@ try:
     )
 except ImportError:
     # Inline definitions for standalone operation
-    @dataclass
+    @dataclass(**_DATACLASS_SLOTS)
     class Coordinate4D:
         temporal: float = 0.0
         valence: float = 0.0
@@ -55,6 +64,11 @@ class TurnPhase(Enum):
     END = "end"
 
 
+# Phase that follows each phase (END wraps to DRAW)
+NEXT_PHASE = {phase: following for phase, following in
+              zip(TurnPhase, list(TurnPhase)[1:] + [TurnPhase.DRAW])}
+
+
 class GameEvent(Enum):
     GAME_STARTED = "game_started"
     TURN_STARTED = "turn_started"
@@ -78,49 +92,78 @@ DECK_RULES = {
     "win_score": 100,
 }
 
+# Dense card index: suit order × rank, 0..51 (AS = 0, KC = 51)
+SUIT_ORDER = ('S', 'H', 'D', 'C')
+RANK_SYMBOLS = ('A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+CARD_IDS = tuple(f"{sym}{suit}" for suit in SUIT_ORDER for sym in RANK_SYMBOLS)
+CARD_INDEX = {card_id: i for i, card_id in enumerate(CARD_IDS)}
+RANK_VALUES = {'A': 1, 'J': 11, 'Q': 12, 'K': 13}
+SUIT_FREQUENCY_OFFSETS = {'S': 0.1, 'H': 0.2, 'C': 0.15, 'D': 0.25}
+
+# Saved coupling tables: magic, 52×52 little-endian doubles, 52×51 neighbour bytes
+COUPLING_TABLE_MAGIC = b'QRCPL001'
+COUPLING_TABLE_ENV = 'QR_COUPLING_TABLE'
+
 
 # =============================================================================
 # CARD DATA STRUCTURE
 # =============================================================================
 
-@dataclass
+class CardCoordinate(NamedTuple):
+    """Read-only 4D coordinate of a Card (the fields of Coordinate4D)."""
+    temporal: float
+    valence: float
+    concrete: float
+    arousal: float
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Card:
-    """Game-ready card with all mathematical properties."""
+    """
+    Game-ready card with all mathematical properties.
+    
+    Cards are immutable and interned: create_card returns one shared
+    prototype per ID, so copies in different decks and games are the same
+    object. Temporary modifiers live in a per-player ModifierTable. The
+    coordinate is stored as an immutable CardCoordinate snapshot of the one
+    passed in, so the derived values below can never go stale.
+    """
     card_id: str
     suit: str
     rank: int
-    coordinate: Coordinate4D
+    coordinate: CardCoordinate
     phase: float
     natural_frequency: float
     
-    # Temporary modifiers (reset each turn)
-    temp_valence_mod: float = 0.0
-    temp_concrete_mod: float = 0.0
-    temp_arousal_mod: float = 0.0
-    temp_score_multiplier: float = 1.0
+    # Position in CARD_IDS (-1 for IDs outside the standard 52)
+    index: int = -1
+    
+    # Derived values gathered by FormationView:
+    # (temporal, valence, concrete, arousal), cos(phase), sin(phase)
+    vector: Tuple[float, float, float, float] = field(init=False, repr=False, compare=False)
+    cos_phase: float = field(init=False, repr=False, compare=False)
+    sin_phase: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.index < 0:
+            object.__setattr__(self, 'index', CARD_INDEX.get(self.card_id, -1))
+        c = self.coordinate
+        coordinate = CardCoordinate(c.temporal, c.valence, c.concrete, c.arousal)
+        object.__setattr__(self, 'coordinate', coordinate)
+        object.__setattr__(self, 'vector', tuple(coordinate))
+        object.__setattr__(self, 'cos_phase', math.cos(self.phase))
+        object.__setattr__(self, 'sin_phase', math.sin(self.phase))
     
     @property
-    def effective_coordinate(self) -> Coordinate4D:
-        """Coordinate with temporary modifiers applied."""
-        return Coordinate4D(
-            temporal=self.coordinate.temporal,
-            valence=self.coordinate.valence + self.temp_valence_mod,
-            concrete=self.coordinate.concrete + self.temp_concrete_mod,
-            arousal=self.coordinate.arousal + self.temp_arousal_mod,
-        )
+    def effective_coordinate(self) -> CardCoordinate:
+        """Coordinate without modifiers (see ModifierTable.effective_coordinate)."""
+        return self.coordinate
     
     @property
     def base_points(self) -> int:
         """Base score from rank."""
         return self.rank
     
-    def reset_modifiers(self) -> None:
-        """Clear all temporary modifiers."""
-        self.temp_valence_mod = 0.0
-        self.temp_concrete_mod = 0.0
-        self.temp_arousal_mod = 0.0
-        self.temp_score_multiplier = 1.0
-    
     def __hash__(self):
         return hash(self.card_id)
     
@@ -128,10 +171,33 @@ class Card:
         if isinstance(other, Card):
             return self.card_id == other.card_id
         return False
+    
+    def __reduce__(self):
+        # Unpickle (e.g. in worker processes) to the interned prototype
+        return (create_card, (self.card_id,))
+
+
+# Interned prototypes by card ID, filled on first request
+_CARD_PROTOTYPES: Dict[str, Card] = {}
 
 
 def create_card(card_id: str) -> Card:
-    """Factory function to create a card from ID (e.g., 'AS', 'KH')."""
+    """Interned card for an ID (e.g., 'AS', 'KH'); the same object every call."""
+    card = _CARD_PROTOTYPES.get(card_id)
+    if card is None:
+        card = _build_card(card_id)
+        if card.index >= 0:
+            _CARD_PROTOTYPES[card_id] = card
+    return card
+
+
+def card_from_index(index: int) -> Card:
+    """Interned card for a dense index 0..51."""
+    return create_card(CARD_IDS[index])
+
+
+def _build_card(card_id: str) -> Card:
+    """Parse a card ID and compute its geometry."""
     # Parse card ID
     if card_id.startswith('10'):
         rank_sym = '10'
@@ -141,8 +207,7 @@ def create_card(card_id: str) -> Card:
         suit = card_id[1]
     
     # Map symbol to rank
-    rank_map = {'A': 1, 'J': 11, 'Q': 12, 'K': 13}
-    rank = rank_map.get(rank_sym, int(rank_sym) if rank_sym.isdigit() else 1)
+    rank = RANK_VALUES.get(rank_sym, int(rank_sym) if rank_sym.isdigit() else 1)
     
     # Calculate coordinate
     rank_value = (rank - 7) / 6.0
@@ -170,13 +235,11 @@ def create_card(card_id: str) -> Card:
         coord.arousal = rank_value * 0.1
     
     # Calculate phase
-    suit_order = ['S', 'H', 'D', 'C']
-    card_index = suit_order.index(suit) * 13 + (rank - 1)
+    card_index = SUIT_ORDER.index(suit) * 13 + (rank - 1)
     phase = (card_index / 52) * 2 * math.pi
     
     # Natural frequency
-    freq_offsets = {'S': 0.1, 'H': 0.2, 'C': 0.15, 'D': 0.25}
-    natural_freq = 1.0 + freq_offsets.get(suit, 0)
+    natural_freq = 1.0 + SUIT_FREQUENCY_OFFSETS.get(suit, 0)
     
     return Card(
         card_id=card_id,
@@ -185,35 +248,157 @@ def create_card(card_id: str) -> Card:
         coordinate=coord,
         phase=phase,
         natural_frequency=natural_freq,
+        index=CARD_INDEX.get(card_id, -1),
     )
 
 
+@dataclass
+class CardModifiers:
+    """Temporary modifiers for one card (reset each turn)."""
+    valence: float = 0.0
+    concrete: float = 0.0
+    arousal: float = 0.0
+    score_multiplier: float = 1.0
+
+
+class ModifierTable:
+    """
+    Side table of temporary card modifiers, keyed by card ID.
+    
+    Holds entries only for modified cards, so it is empty (and scoring
+    takes the unmodified path) most of the time. All copies of a card
+    held by the same player share one entry.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, CardModifiers] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, card: Card) -> Optional[CardModifiers]:
+        return self._entries.get(card.card_id)
+    
+    def modify(self, card: Card, valence: float = 0.0, concrete: float = 0.0,
+               arousal: float = 0.0, score_multiplier: float = 1.0) -> CardModifiers:
+        """Add coordinate offsets and multiply the score multiplier."""
+        mods = self._entries.get(card.card_id)
+        if mods is None:
+            mods = self._entries[card.card_id] = CardModifiers()
+        mods.valence += valence
+        mods.concrete += concrete
+        mods.arousal += arousal
+        mods.score_multiplier *= score_multiplier
+        return mods
+    
+    def reset(self, cards: List[Card]) -> None:
+        """Clear the modifiers of the given cards."""
+        for card in cards:
+            self._entries.pop(card.card_id, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def effective_coordinate(self, card: Card) -> Coordinate4D:
+        """Coordinate with this table's modifiers applied."""
+        mods = self._entries.get(card.card_id)
+        if mods is None:
+            return card.coordinate
+        return Coordinate4D(*self.effective_vector(card))
+    
+    def effective_vector(self, card: Card) -> Tuple[float, float, float, float]:
+        """Card.vector with this table's modifiers applied."""
+        mods = self._entries.get(card.card_id)
+        if mods is None:
+            return card.vector
+        temporal, valence, concrete, arousal = card.vector
+        return (temporal, valence + mods.valence, concrete + mods.concrete,
+                arousal + mods.arousal)
+    
+    def score_multiplier(self, card: Card) -> float:
+        mods = self._entries.get(card.card_id)
+        return 1.0 if mods is None else mods.score_multiplier
+
+
 # =============================================================================
 # COUPLING NETWORK
 # =============================================================================
 
 class CouplingNetwork:
-    """Manages the 2,652 coupling relationships between cards."""
+    """
+    Manages the 2,652 coupling relationships between cards.
+    
+    Weights live in a 52×52 table indexed by Card.index; weights[i][j] is
+    the coupling from CARD_IDS[i] to CARD_IDS[j], and the diagonal is 0.0
+    (a card does not couple to itself or to its own duplicate).
+    neighbors[i] lists the other 51 indices by descending coupling (ties in
+    CARD_IDS order).
+    
+    save() writes both tables to a binary file; from_file() maps one back
+    read-only (mmap), so processes that load the same file share its pages
+    and skip the build entirely.
+    """
     
     def __init__(self):
-        self._cache: Dict[Tuple[str, str], float] = {}
+        self.weights: List[List[float]] = []
+        self.neighbors: List[List[int]] = []
+        self._ranked: List[Optional[List[Tuple[str, float]]]] = []
         self._precompute_all()
     
     def _precompute_all(self) -> None:
-        """Precompute all coupling weights."""
-        suits = ['S', 'H', 'D', 'C']
-        ranks = list(range(1, 14))
-        rank_syms = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
-        
-        all_ids = [f"{rank_syms[r-1]}{s}" for s in suits for r in ranks]
+        """Precompute all coupling weights from the 52 base coordinates."""
+        cards = [create_card(card_id) for card_id in CARD_IDS]
+        self.weights = [
+            [0.0 if a is b else self._calculate_coupling(a, b) for b in cards]
+            for a in cards
+        ]
+        self._build_neighbors()
+    
+    def _build_neighbors(self) -> None:
+        """Sort each card's neighbours once, strongest first."""
+        self.neighbors = []
+        for i, row in enumerate(self.weights):
+            self.neighbors.append(
+                sorted((j for j in range(len(row)) if j != i), key=lambda j: -row[j])
+            )
+        self._ranked = [None] * len(self.weights)
+    
+    def save(self, path: str) -> None:
+        """Write the weight and neighbour tables to a binary file."""
+        weights = array('d', (w for row in self.weights for w in row))
+        if sys.byteorder == 'big':
+            weights.byteswap()
+        with open(path, 'wb') as f:
+            f.write(COUPLING_TABLE_MAGIC)
+            f.write(weights.tobytes())
+            f.write(bytes(j for order in self.neighbors for j in order))
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'CouplingNetwork':
+        """Load a table written by save(), memory-mapped where possible."""
+        n = len(CARD_IDS)
+        weight_bytes = n * n * 8
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        header = len(COUPLING_TABLE_MAGIC)
+        if data[:header] != COUPLING_TABLE_MAGIC or len(data) != header + weight_bytes + n * (n - 1):
+            data.close()
+            raise ValueError(f"{path} is not a coupling table")
+        
+        view = memoryview(data)
+        if sys.byteorder == 'little':
+            table = view[header:header + weight_bytes].cast('d')
+        else:
+            table = array('d', view[header:header + weight_bytes])
+            table.byteswap()
+        order = view[header + weight_bytes:]
         
-        for id_a in all_ids:
-            card_a = create_card(id_a)
-            for id_b in all_ids:
-                if id_a != id_b:
-                    card_b = create_card(id_b)
-                    coupling = self._calculate_coupling(card_a, card_b)
-                    self._cache[(id_a, id_b)] = coupling
+        network = cls.__new__(cls)
+        network.weights = [table[i * n:(i + 1) * n] for i in range(n)]
+        network.neighbors = [order[i * (n - 1):(i + 1) * (n - 1)] for i in range(n)]
+        network._ranked = [None] * n
+        return network
     
     def _calculate_coupling(self, card_a: Card, card_b: Card) -> float:
         """Calculate coupling strength based on 4D distance."""
@@ -231,22 +416,80 @@ class CouplingNetwork:
     
     def get_coupling(self, card_a: Card, card_b: Card) -> float:
         """Get coupling weight between two cards."""
-        key = (card_a.card_id, card_b.card_id)
-        return self._cache.get(key, 0.0)
-    
-    def get_strongest_neighbors(self, card: Card, n: int = 5) -> List[Tuple[str, float]]:
-        """Get the n strongest coupled cards."""
-        neighbors = [
-            (other_id, weight)
-            for (card_id, other_id), weight in self._cache.items()
-            if card_id == card.card_id
-        ]
-        neighbors.sort(key=lambda x: x[1], reverse=True)
-        return neighbors[:n]
+        i, j = card_a.index, card_b.index
+        if i < 0 or j < 0:
+            return 0.0
+        return self.weights[i][j]
+    
+    def get_strongest_neighbors(self, card: Card, n: int = 5,
+                                among: Optional[List[Card]] = None) -> List[Tuple[str, float]]:
+        """
+        Get the n strongest coupled cards.
+        
+        among restricts the result to those cards (e.g. the current hand or
+        deck); each card ID appears at most once.
+        """
+        if card.index < 0:
+            return []
+        if among is None:
+            ranked = self._ranked[card.index]
+            if ranked is None:
+                row = self.weights[card.index]
+                ranked = [(CARD_IDS[j], row[j]) for j in self.neighbors[card.index]]
+                self._ranked[card.index] = ranked
+            return ranked[:n]
+        
+        neighbors = []
+        if n <= 0:
+            return neighbors
+        allowed = {c.index for c in among}
+        for j in self.neighbors[card.index]:
+            if j in allowed:
+                neighbors.append((CARD_IDS[j], self.weights[card.index][j]))
+                if len(neighbors) == n:
+                    break
+        return neighbors
+
+
+# Shared coupling network, created on first use (see get_coupling_network)
+_COUPLING_NETWORK: Optional[CouplingNetwork] = None
+
+
+def get_coupling_network() -> CouplingNetwork:
+    """
+    The shared CouplingNetwork, built on first use.
+    
+    If the QR_COUPLING_TABLE environment variable names a file written by
+    CouplingNetwork.save(), the table is memory-mapped from it instead.
+    """
+    global _COUPLING_NETWORK
+    if _COUPLING_NETWORK is None:
+        path = os.environ.get(COUPLING_TABLE_ENV)
+        _COUPLING_NETWORK = CouplingNetwork.from_file(path) if path else CouplingNetwork()
+    return _COUPLING_NETWORK
+
+
+def use_coupling_table(path: str) -> CouplingNetwork:
+    """
+    Map a saved table as the shared network, writing it first if missing.
+    
+    Also exports QR_COUPLING_TABLE so worker processes started afterwards
+    map the same file instead of rebuilding the network.
+    """
+    global _COUPLING_NETWORK
+    path = str(path)
+    if not os.path.exists(path):
+        (_COUPLING_NETWORK or CouplingNetwork()).save(path)
+    _COUPLING_NETWORK = CouplingNetwork.from_file(path)
+    os.environ[COUPLING_TABLE_ENV] = path
+    return _COUPLING_NETWORK
 
 
-# Global coupling network instance
-COUPLING_NETWORK = CouplingNetwork()
+def __getattr__(name: str):
+    # COUPLING_NETWORK used to be built at import; keep it as a lazy alias
+    if name == 'COUPLING_NETWORK':
+        return get_coupling_network()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # =============================================================================
@@ -263,21 +506,103 @@ def euclidean_4d(a: Coordinate4D, b: Coordinate4D) -> float:
     )
 
 
-def calculate_centroid(cards: List[Card]) -> Coordinate4D:
+class FormationView:
+    """
+    Struct-of-arrays view of a formation, gathered in one pass.
+    
+    coords holds the effective 4D coordinates of every card back to back in
+    one contiguous array('d') (temporal, valence, concrete, arousal per
+    card); phases, ranks, suits and indices are parallel lists, multipliers
+    is None unless modifiers apply, and the coordinate totals, cos/sin phase
+    sums and per-suit counts are accumulated on the way. The scoring
+    functions accept a view in place of a card list.
+    """
+    __slots__ = ('cards', 'coords', 'phases', 'ranks', 'suits', 'indices',
+                 'multipliers', 'totals', 'sum_cos', 'sum_sin', 'suit_counts')
+    
+    def __init__(self, cards: List[Card], modifiers: Optional[ModifierTable] = None):
+        self.cards = cards
+        self.coords = coords = array('d')
+        self.phases = phases = []
+        self.ranks = ranks = []
+        self.suits = suits = []
+        self.indices = indices = []
+        self.suit_counts = suit_counts = {}
+        self.multipliers = [] if modifiers else None
+        effective_vector = modifiers.effective_vector if modifiers else None
+        
+        # Sequential sums, in the same order as sum() over the cards
+        st = sv = sc = sa = 0.0
+        sum_cos = sum_sin = 0.0
+        for card in cards:
+            vector = card.vector if effective_vector is None else effective_vector(card)
+            coords.extend(vector)
+            st += vector[0]
+            sv += vector[1]
+            sc += vector[2]
+            sa += vector[3]
+            sum_cos += card.cos_phase
+            sum_sin += card.sin_phase
+            phases.append(card.phase)
+            ranks.append(card.rank)
+            suits.append(card.suit)
+            indices.append(card.index)
+            suit_counts[card.suit] = suit_counts.get(card.suit, 0) + 1
+        if modifiers:
+            self.multipliers = [modifiers.score_multiplier(c) for c in cards]
+        
+        self.totals = (st, sv, sc, sa)
+        self.sum_cos = sum_cos
+        self.sum_sin = sum_sin
+    
+    def __len__(self) -> int:
+        return len(self.cards)
+    
+    def centroid(self) -> Tuple[float, float, float, float]:
+        """Mean (temporal, valence, concrete, arousal)."""
+        n = len(self.cards)
+        st, sv, sc, sa = self.totals
+        return (st / n, sv / n, sc / n, sa / n)
+    
+    def mean_centroid_distance(self) -> float:
+        """Average 4D distance of the cards from their centroid."""
+        ct, cv, cc, ca = self.centroid()
+        sqrt = math.sqrt
+        total = 0.0
+        values = iter(self.coords)
+        for t, v, c, a in zip(values, values, values, values):
+            total += sqrt((t - ct) ** 2 + (v - cv) ** 2 + (c - cc) ** 2 + (a - ca) ** 2)
+        return total / len(self.cards)
+    
+    def coherence(self) -> float:
+        """Kuramoto order parameter R of the phases."""
+        return math.sqrt(self.sum_cos ** 2 + self.sum_sin ** 2) / len(self.cards)
+    
+    def base_score(self) -> int:
+        """Sum of ranks times score multipliers."""
+        if self.multipliers is None:
+            return sum(self.ranks)
+        return sum(int(r * m) for r, m in zip(self.ranks, self.multipliers))
+
+
+def formation_view(cards, modifiers: Optional[ModifierTable] = None) -> FormationView:
+    """cards as a FormationView (passed through if it already is one)."""
+    if isinstance(cards, FormationView):
+        return cards
+    return FormationView(cards, modifiers)
+
+
+def calculate_centroid(cards: List[Card],
+                       modifiers: Optional[ModifierTable] = None) -> Coordinate4D:
     """Calculate the centroid (average position) of cards in 4D."""
-    if not cards:
+    if not len(cards):
         return Coordinate4D()
     
-    n = len(cards)
-    return Coordinate4D(
-        temporal=sum(c.effective_coordinate.temporal for c in cards) / n,
-        valence=sum(c.effective_coordinate.valence for c in cards) / n,
-        concrete=sum(c.effective_coordinate.concrete for c in cards) / n,
-        arousal=sum(c.effective_coordinate.arousal for c in cards) / n,
-    )
+    return Coordinate4D(*formation_view(cards, modifiers).centroid())
 
 
-def calculate_cluster_bonus(cards: List[Card]) -> int:
+def calculate_cluster_bonus(cards: List[Card],
+                            modifiers: Optional[ModifierTable] = None) -> int:
     """
     Calculate bonus for 4D spatial clustering.
     Tighter clusters = higher bonus.
@@ -285,14 +610,8 @@ def calculate_cluster_bonus(cards: List[Card]) -> int:
     if len(cards) < 2:
         return 0
     
-    centroid = calculate_centroid(cards)
-    
-    # Calculate average distance from centroid
-    distances = [
-        euclidean_4d(card.effective_coordinate, centroid)
-        for card in cards
-    ]
-    avg_distance = sum(distances) / len(distances)
+    # Average distance from centroid
+    avg_distance = formation_view(cards, modifiers).mean_centroid_distance()
     
     # Max bonus at distance 0, zero bonus at distance >= 1.0
     if avg_distance >= 1.0:
@@ -306,8 +625,10 @@ def calculate_coherence(cards: List[Card]) -> float:
     Calculate Kuramoto order parameter R ∈ [0, 1].
     Higher = more phase synchronized.
     """
-    if not cards:
+    if not len(cards):
         return 0.0
+    if isinstance(cards, FormationView):
+        return cards.coherence()
     
     n = len(cards)
     sum_cos = sum(math.cos(c.phase) for c in cards)
@@ -321,56 +642,179 @@ def calculate_resonance_bonus(cards: List[Card]) -> int:
     if len(cards) < 2:
         return 0
     
-    coherence = calculate_coherence(cards)
-    
-    if coherence >= 0.9:
-        return 30  # Perfect resonance
-    elif coherence >= 0.7:
-        return 20  # Strong resonance
-    elif coherence >= 0.5:
-        return 10  # Moderate resonance
+    return resonance_for_coherence(calculate_coherence(cards))
+
+
+# (minimum coherence, bonus), highest tier first
+RESONANCE_TIERS = (
+    (0.9, 30),  # Perfect resonance
+    (0.7, 20),  # Strong resonance
+    (0.5, 10),  # Moderate resonance
+)
+
+
+def resonance_for_coherence(coherence: float) -> int:
+    """Resonance bonus tier for a coherence R."""
+    for threshold, bonus in RESONANCE_TIERS:
+        if coherence >= threshold:
+            return bonus
     return 0
 
 
-def calculate_chain_bonus(cards: List[Card]) -> int:
-    """Calculate bonus for coupling network chains."""
+def calculate_chain_bonus(cards: List[Card], exact: bool = False) -> int:
+    """
+    Calculate bonus for coupling network chains.
+    
+    The rules chain greedily from the first card played; exact=True scores
+    the best chain over all start cards and orderings instead (see
+    optimal_chain).
+    """
     if len(cards) < 2:
         return 0
+    indices = cards.indices if isinstance(cards, FormationView) else [c.index for c in cards]
+    if exact:
+        return optimal_chain(indices)[0]
+    return chain_bonus_for_indices(indices)
+
+
+def chain_bonus_for_indices(indices: List[int]) -> int:
+    """Chain bonus for cards given by index (in formation order)."""
+    if len(indices) < 2:
+        return 0
+    
+    weights = get_coupling_network().weights
     
     # Sort by strongest coupling path (greedy)
-    remaining = list(cards)
-    chain = [remaining.pop(0)]
+    remaining = list(indices)
+    current = remaining.pop(0)
+    chain_length = 1
     total_coupling = 0
     chain_broken = False
     
     while remaining and not chain_broken:
-        current = chain[-1]
         best_coupling = 0
-        best_card = None
+        best_pos = -1
         
-        for card in remaining:
-            coupling = COUPLING_NETWORK.get_coupling(current, card)
-            if coupling > best_coupling:
-                best_coupling = coupling
-                best_card = card
+        # Non-standard cards (index -1) couple to nothing
+        if current >= 0:
+            row = weights[current]
+            for pos, j in enumerate(remaining):
+                if j >= 0 and row[j] > best_coupling:
+                    best_coupling = row[j]
+                    best_pos = pos
         
         if best_coupling >= 0.4:
-            chain.append(best_card)
-            remaining.remove(best_card)
+            current = remaining.pop(best_pos)
+            chain_length += 1
             total_coupling += int(best_coupling * 10)
         else:
             chain_broken = True
     
     # Unbroken chain bonus
-    if len(chain) >= 3 and not chain_broken:
+    if chain_length >= 3 and not chain_broken:
         total_coupling += 15
     
     return total_coupling
 
 
-def calculate_base_score(cards: List[Card]) -> int:
+def optimal_chain(indices: List[int]) -> Tuple[int, List[int]]:
+    """
+    Exact best chain: (bonus, order) over all start cards and orderings.
+    
+    A chain is a path through distinct formation cards whose consecutive
+    couplings are all >= 0.4; it scores int(w * 10) per link, plus 15 if it
+    covers all cards (3 or more), the same scoring as the greedy chain.
+    Bitmask DP over (visited set, last card) finds the optimum in
+    O(2^n · n^2) instead of n! orderings. order lists positions into
+    indices: the chain first, then the unchained cards in their original
+    order.
+    """
+    n = len(indices)
+    if n < 2:
+        return 0, list(range(n))
+    
+    weights = get_coupling_network().weights
+    
+    # Links (next position, value, bit) per position; no link below 0.4
+    links = []
+    for a, i in enumerate(indices):
+        row = weights[i] if i >= 0 else None
+        out = []
+        if row is not None:
+            for b, j in enumerate(indices):
+                if b != a and j >= 0 and row[j] >= 0.4:
+                    out.append((b, int(row[j] * 10), 1 << b))
+        links.append(out)
+    
+    # best[mask][a]: highest link total of a path visiting mask, ending at a
+    full = (1 << n) - 1
+    best = [[-1] * n for _ in range(full + 1)]
+    parent = [[-1] * n for _ in range(full + 1)]
+    for a in range(n):
+        best[1 << a][a] = 0
+    
+    for mask in range(1, full + 1):
+        row = best[mask]
+        if max(row) < 0:
+            continue
+        for a in range(n):
+            value = row[a]
+            if value < 0:
+                continue
+            for b, link, bit in links[a]:
+                if mask & bit:
+                    continue
+                extended = mask | bit
+                if value + link > best[extended][b]:
+                    best[extended][b] = value + link
+                    parent[extended][b] = a
+    
+    # Best end state; covering every card earns the unbroken bonus
+    best_total, best_mask, best_end = 0, 1, 0
+    for mask in range(1, full + 1):
+        bonus = 15 if mask == full and n >= 3 else 0
+        for a in range(n):
+            if best[mask][a] >= 0 and best[mask][a] + bonus > best_total:
+                best_total, best_mask, best_end = best[mask][a] + bonus, mask, a
+    
+    chain = []
+    mask, a = best_mask, best_end
+    while a >= 0:
+        chain.append(a)
+        mask, a = mask & ~(1 << a), parent[mask][a]
+    chain.reverse()
+    
+    in_chain = set(chain)
+    return best_total, chain + [p for p in range(n) if p not in in_chain]
+
+
+def optimal_chain_order(cards: List[Card]) -> List[Card]:
+    """
+    cards reordered to play for the highest chain bonus under the rules.
+    
+    The greedy rule picks each next link itself, so only the first card
+    matters: this tries every start card and returns the best one first,
+    then the rest in their original order. Playing it scores exactly
+    calculate_chain_bonus of the result, which can fall short of
+    optimal_chain (the best chain over all orderings, an analysis bound).
+    """
+    indices = [c.index for c in cards]
+    best_bonus, best_start = -1, 0
+    for start in range(len(cards)):
+        bonus = chain_bonus_for_indices([indices[start]] + indices[:start] + indices[start + 1:])
+        if bonus > best_bonus:
+            best_bonus, best_start = bonus, start
+    return [cards[best_start]] + cards[:best_start] + cards[best_start + 1:]
+
+
+def calculate_base_score(cards: List[Card],
+                         modifiers: Optional[ModifierTable] = None) -> int:
     """Calculate base score from card ranks."""
-    return sum(int(c.base_points * c.temp_score_multiplier) for c in cards)
+    if isinstance(cards, FormationView):
+        return cards.base_score()
+    if not modifiers:
+        return sum(c.base_points for c in cards)
+    return sum(int(c.base_points * modifiers.score_multiplier(c)) for c in cards)
 
 
 @dataclass
@@ -388,17 +832,189 @@ class ScoreBreakdown:
 
 
 def calculate_full_score(cards: List[Card], faction: 'Faction', 
-                         field_state: 'FieldState') -> ScoreBreakdown:
+                         field_state: 'FieldState',
+                         modifiers: Optional[ModifierTable] = None) -> ScoreBreakdown:
     """Calculate complete score breakdown for a formation."""
+    return score_formation(cards, faction, field_state, modifiers)
+
+
+def score_formation(cards: List[Card], faction: 'Faction', field_state: 'FieldState',
+                    modifiers: Optional[ModifierTable] = None) -> ScoreBreakdown:
+    """
+    Fused scorer: gathers the formation once (FormationView) and derives all
+    five components from that one set of arrays. Gives the same breakdown
+    as the per-component functions for every input.
+    """
+    view = formation_view(cards, modifiers)
+    cluster, resonance, _ = _geometry_bonuses(view)
     return ScoreBreakdown(
-        base=calculate_base_score(cards),
-        cluster=calculate_cluster_bonus(cards),
-        chain=calculate_chain_bonus(cards),
-        resonance=calculate_resonance_bonus(cards),
-        faction=faction.calculate_bonus(cards, field_state),
+        base=view.base_score(),
+        cluster=cluster,
+        chain=chain_bonus_for_indices(view.indices),
+        resonance=resonance,
+        faction=_faction_bonus(faction, view, field_state),
     )
 
 
+# Distance of a float score input from a rounding/tier boundary below which
+# summation order could change the result
+ORDER_MARGIN = 1e-9
+
+
+def _geometry_bonuses(view: FormationView) -> Tuple[int, int, bool]:
+    """
+    (cluster, resonance, order_free) for a gathered formation.
+    
+    Both bonuses come from float sums over the cards, so reordering the
+    cards can move them by a few ulps. order_free is False when a value lies
+    within ORDER_MARGIN of a truncation or tier boundary, i.e. when another
+    order of the same cards might score differently.
+    """
+    n = len(view)
+    if n < 2:
+        return 0, 0, True
+    
+    cluster = 0
+    avg_distance = view.mean_centroid_distance()
+    order_free = abs(avg_distance - 1.0) >= ORDER_MARGIN
+    if avg_distance < 1.0:
+        raw = (1.0 - avg_distance) * 20 * n
+        cluster = int(raw)
+        order_free = order_free and abs(raw - round(raw)) >= ORDER_MARGIN
+    
+    coherence = view.coherence()
+    order_free = order_free and all(
+        abs(coherence - threshold) >= ORDER_MARGIN for threshold, _ in RESONANCE_TIERS
+    )
+    return cluster, resonance_for_coherence(coherence), order_free
+
+
+def _faction_bonus(faction: 'Faction', view: FormationView, field_state: 'FieldState') -> int:
+    """Faction bonus from the view (card list for legacy calculate_bonus overrides)."""
+    if type(faction).calculate_bonus is Faction.calculate_bonus:
+        return faction.formation_bonus(view, field_state)
+    return faction.calculate_bonus(view.cards, field_state)
+
+
+# Bit per suit for ScoreCache keys
+SUIT_BITS = {suit: 1 << i for i, suit in enumerate(SUIT_ORDER)}
+
+
+class ScoreCache:
+    """
+    Bounded LRU memo of score_formation for unmodified formations.
+    
+    Base, cluster, resonance and faction bonuses are stored under a
+    canonical multiset bitmask (4 bits per card index, so duplicates count),
+    the faction class and the last-turn suit set. The chain bonus depends on
+    play order and is memoized separately by the ordered card indices.
+    Formations whose cluster/resonance inputs sit on a rounding boundary
+    (see _geometry_bonuses) are stored by ordered indices too, so cached
+    breakdowns always equal uncached ones.
+    
+    Formations with active modifiers or non-standard cards bypass the
+    cache. hits/misses count formation lookups, chain_hits/chain_misses
+    chain lookups, and evictions covers both tables.
+    """
+    
+    # Marks a multiset whose score depends on card order
+    _ORDERED = object()
+    
+    def __init__(self, maxsize: int = 65536):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._scores: OrderedDict = OrderedDict()
+        self._chains: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.chain_hits = 0
+        self.chain_misses = 0
+        self.evictions = 0
+        self.bypasses = 0
+    
+    def score(self, cards: List[Card], faction: 'Faction', field_state: 'FieldState',
+              modifiers: Optional[ModifierTable] = None) -> ScoreBreakdown:
+        """score_formation, served from the cache where possible."""
+        if modifiers and any(modifiers.get(c) is not None for c in cards):
+            self.bypasses += 1
+            return score_formation(cards, faction, field_state, modifiers)
+        
+        mask = 0
+        indices = []
+        for card in cards:
+            if card.index < 0:
+                self.bypasses += 1
+                return score_formation(cards, faction, field_state)
+            mask += 1 << (card.index << 2)
+            indices.append(card.index)
+        indices = tuple(indices)
+        
+        suits = 0
+        for suit in field_state.last_turn_suits:
+            suits |= SUIT_BITS.get(suit, 0)
+        key = (mask, type(faction), suits)
+        
+        parts = self._get(self._scores, key)
+        if parts is self._ORDERED:
+            key = (indices, type(faction), suits)
+            parts = self._get(self._scores, key)
+        if parts is None:
+            self.misses += 1
+            view = FormationView(cards)
+            cluster, resonance, order_free = _geometry_bonuses(view)
+            parts = (view.base_score(), cluster, resonance,
+                     _faction_bonus(faction, view, field_state))
+            if not order_free:
+                self._put(self._scores, key, self._ORDERED)
+                key = (indices, type(faction), suits)
+            self._put(self._scores, key, parts)
+        else:
+            self.hits += 1
+        
+        chain = self._get(self._chains, indices)
+        if chain is None:
+            self.chain_misses += 1
+            chain = chain_bonus_for_indices(indices)
+            self._put(self._chains, indices, chain)
+        else:
+            self.chain_hits += 1
+        
+        base, cluster, resonance, faction_bonus = parts
+        return ScoreBreakdown(base=base, cluster=cluster, chain=chain,
+                              resonance=resonance, faction=faction_bonus)
+    
+    def _get(self, table: OrderedDict, key):
+        value = table.get(key)
+        if value is not None:
+            table.move_to_end(key)
+        return value
+    
+    def _put(self, table: OrderedDict, key, value) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        if len(table) > self.maxsize:
+            table.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        self._scores.clear()
+        self._chains.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Counters and current table sizes."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'chain_hits': self.chain_hits,
+            'chain_misses': self.chain_misses,
+            'evictions': self.evictions,
+            'bypasses': self.bypasses,
+            'entries': len(self._scores),
+            'chain_entries': len(self._chains),
+        }
+
+
 # =============================================================================
 # FACTION SYSTEM
 # =============================================================================
@@ -422,9 +1038,20 @@ class Faction:
         self.abilities: List[Ability] = []
     
     def calculate_bonus(self, cards: List[Card], field_state: 'FieldState') -> int:
-        """Override in subclasses."""
+        """Faction bonus for a formation (see formation_bonus)."""
+        return self.formation_bonus(formation_view(cards), field_state)
+    
+    def formation_bonus(self, view: FormationView, field_state: 'FieldState') -> int:
+        """Override in subclasses; view is the gathered formation."""
         return 0
     
+    def bonus_bound(self, n_cards: int) -> Optional[int]:
+        """
+        Upper bound on formation_bonus for formations of at most n_cards,
+        used to prune play searches. None (the default) means unknown.
+        """
+        return None
+    
     def on_card_played(self, card: Card, game_state: 'GameState') -> None:
         """Passive trigger when a card is played."""
         pass
@@ -446,21 +1073,23 @@ class SpadesFaction(Faction):
             Ability("time_lock", 3, 3, "Lock a card in opponent's hand"),
         ]
     
-    def calculate_bonus(self, cards: List[Card], field_state: 'FieldState') -> int:
+    def formation_bonus(self, view: FormationView, field_state: 'FieldState') -> int:
         bonus = 0
-        spades = [c for c in cards if c.suit == 'S']
+        spades = view.suit_counts.get('S', 0)
         
         # +3 for each Spades beyond the first
-        if len(spades) > 1:
-            bonus += (len(spades) - 1) * 3
+        if spades > 1:
+            bonus += (spades - 1) * 3
         
         # +5 for Ace-King span in any suit
-        ranks = {c.rank for c in cards}
-        if 1 in ranks and 13 in ranks:
+        if 1 in view.ranks and 13 in view.ranks:
             bonus += 5
         
         return bonus
     
+    def bonus_bound(self, n_cards: int) -> Optional[int]:
+        return max(n_cards - 1, 0) * 3 + 5
+    
     def on_card_played(self, card: Card, game_state: 'GameState') -> None:
         """Temporal Echo: Look at top card when playing Spades."""
         if card.suit == 'S' and game_state.current_player.deck:
@@ -484,19 +1113,22 @@ class HeartsFaction(Faction):
             Ability("emotional_surge", 3, 3, "Double Hearts bonuses this turn"),
         ]
     
-    def calculate_bonus(self, cards: List[Card], field_state: 'FieldState') -> int:
+    def formation_bonus(self, view: FormationView, field_state: 'FieldState') -> int:
         bonus = 0
-        hearts = [c for c in cards if c.suit == 'H']
         
         # +2 for each Hearts with positive valence (ranks 8-13)
-        bonus += sum(2 for c in hearts if c.rank >= 8)
+        bonus += sum(2 for suit, rank in zip(view.suits, view.ranks)
+                     if suit == 'H' and rank >= 8)
         
         # +10 for pure Hearts formation
-        if cards and all(c.suit == 'H' for c in cards):
+        if len(view) and view.suit_counts.get('H', 0) == len(view):
             bonus += 10
         
         return bonus
     
+    def bonus_bound(self, n_cards: int) -> Optional[int]:
+        return n_cards * 2 + 10
+    
     def on_card_played(self, card: Card, game_state: 'GameState') -> None:
         """Empathic Bond: +2 when opponent plays Hearts."""
         if card.suit == 'H':
@@ -517,20 +1149,23 @@ class DiamondsFaction(Faction):
             Ability("supernova", -1, 4, "Discard hand, score 3x total ranks"),
         ]
     
-    def calculate_bonus(self, cards: List[Card], field_state: 'FieldState') -> int:
+    def formation_bonus(self, view: FormationView, field_state: 'FieldState') -> int:
         bonus = 0
-        diamonds = [c for c in cards if c.suit == 'D']
         
         # +5 for each extreme Diamond (A, J, Q, K)
         extremes = {1, 11, 12, 13}
-        bonus += sum(5 for c in diamonds if c.rank in extremes)
+        bonus += sum(5 for suit, rank in zip(view.suits, view.ranks)
+                     if suit == 'D' and rank in extremes)
         
         # +15 for 4+ card burst
-        if len(cards) >= 4:
+        if len(view) >= 4:
             bonus += 15
         
         return bonus
     
+    def bonus_bound(self, n_cards: int) -> Optional[int]:
+        return n_cards * 5 + 15
+    
     def on_card_played(self, card: Card, game_state: 'GameState') -> None:
         """Brilliance: +5 for 3+ card formations."""
         current_formation = game_state.current_formation
@@ -549,23 +1184,25 @@ class ClubsFaction(Faction):
             Ability("unshakeable", 3, 3, "Score cannot decrease this turn"),
         ]
     
-    def calculate_bonus(self, cards: List[Card], field_state: 'FieldState') -> int:
+    def formation_bonus(self, view: FormationView, field_state: 'FieldState') -> int:
         bonus = 0
-        clubs = [c for c in cards if c.suit == 'C']
         
         # +2 for each Clubs card
-        bonus += len(clubs) * 2
+        bonus += view.suit_counts.get('C', 0) * 2
         
         # +3 per card matching last turn's suits
         if field_state.last_turn_suits:
             matching = sum(
-                1 for c in cards 
-                if c.suit in field_state.last_turn_suits
+                count for suit, count in view.suit_counts.items()
+                if suit in field_state.last_turn_suits
             )
             bonus += matching * 3
         
         return bonus
     
+    def bonus_bound(self, n_cards: int) -> Optional[int]:
+        return n_cards * 5
+    
     def on_card_played(self, card: Card, game_state: 'GameState') -> None:
         """Rooted: Block opponent abilities (handled in ability resolution)."""
         pass
@@ -579,6 +1216,201 @@ FACTIONS = {
 }
 
 
+# =============================================================================
+# PLAY ENUMERATION
+# =============================================================================
+
+class ScoredPlay(NamedTuple):
+    """A formation as a hand bitmask (bit i = hand[i]) and its total score."""
+    mask: int
+    score: int
+
+
+def cards_for_mask(hand: List[Card], mask: int) -> List[Card]:
+    """The cards of hand selected by mask, in hand order."""
+    return [card for i, card in enumerate(hand) if mask >> i & 1]
+
+
+def playable_mask(hand: List[Card], locked_cards=()) -> int:
+    """Bitmask of the hand cards that are not locked."""
+    mask = 0
+    for i, card in enumerate(hand):
+        if card.card_id not in locked_cards:
+            mask |= 1 << i
+    return mask
+
+
+def enumerate_plays(hand: List[Card], faction: Faction, field_state: 'FieldState',
+                    modifiers: Optional[ModifierTable] = None,
+                    top_k: Optional[int] = None,
+                    max_cards: Optional[int] = None) -> List[ScoredPlay]:
+    """
+    Every legal formation from hand (unlocked cards, played in hand order)
+    with its score_formation total.
+    
+    Subsets are walked depth first, each one extending its parent (the
+    subset without its last card) by one card: running sums and a single
+    scratch FormationView are grown and shrunk in place, so scores match
+    score_formation exactly without rebuilding each formation.
+    
+    With top_k, only the k best plays are returned (highest score first,
+    lower mask on ties), and subtrees whose upper bound cannot reach the
+    current k-th best are skipped; pruning needs the faction to define
+    bonus_bound. Without top_k all plays come back in enumeration order.
+    max_cards caps the formation size.
+    """
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    
+    positions = [i for i, card in enumerate(hand)
+                 if card.card_id not in field_state.locked_cards]
+    if max_cards is None or max_cards > len(positions):
+        max_cards = len(positions)
+    if not positions or max_cards < 1:
+        return []
+    
+    effective_vector = modifiers.effective_vector if modifiers else None
+    vectors = [card.vector if effective_vector is None else effective_vector(card)
+               for card in hand]
+    multipliers = ([modifiers.score_multiplier(card) for card in hand]
+                   if modifiers else None)
+    bases = [card.rank if multipliers is None else int(card.rank * multipliers[i])
+             for i, card in enumerate(hand)]
+    
+    # Pruning bounds: each card's base plus its best incoming chain link,
+    # the unbroken chain bonus and the faction's own bound; cluster and
+    # resonance are bounded from the cards already chosen (see visit)
+    faction_bounds = None
+    if type(faction).calculate_bonus is Faction.calculate_bonus and top_k is not None:
+        faction_bounds = [faction.bonus_bound(n) for n in range(max_cards + 1)]
+        if None in faction_bounds:
+            faction_bounds = None
+    if faction_bounds is not None:
+        weights = get_coupling_network().weights
+        card_bounds = [0] * len(hand)
+        for i in positions:
+            link = 0
+            if hand[i].index >= 0:
+                row = weights[hand[i].index]
+                for j in positions:
+                    if hand[j].index >= 0 and row[hand[j].index] >= 0.4:
+                        link = max(link, int(row[hand[j].index] * 10))
+            card_bounds[i] = max(bases[i] + link, 0)
+        # Bound contributed by candidates positions[k:], per k
+        tail_bounds = [0] * (len(positions) + 1)
+        for k in range(len(positions) - 1, -1, -1):
+            tail_bounds[k] = tail_bounds[k + 1] + card_bounds[positions[k]]
+    
+    sqrt = math.sqrt
+    view = FormationView([], modifiers)
+    cards, coords, indices = view.cards, view.coords, view.indices
+    phases, ranks, suits = view.phases, view.ranks, view.suits
+    suit_counts = view.suit_counts
+    results: List = []
+    
+    def visit(start, mask, n, base, st, sv, sc, sa, sum_cos, sum_sin,
+              mask_bound, spread):
+        if faction_bounds is not None:
+            phasor = sqrt(sum_cos ** 2 + sum_sin ** 2)
+        for k in range(start, len(positions)):
+            if faction_bounds is not None and len(results) == top_k:
+                # Best possible score of any formation adding cards from
+                # positions[k:] (later siblings have fewer candidates).
+                # Distances to any centroid sum to at least spread, the
+                # distance total of disjoint chosen pairs, and each further
+                # card adds at most a unit phasor to the coherence sum.
+                n_max = min(n + len(positions) - k, max_cards)
+                bound = (mask_bound + tail_bounds[k] + 15 + faction_bounds[n_max] +
+                         max(int(20 * (n_max - spread)) + 1, 0) +
+                         resonance_for_coherence((phasor + n_max - n) / n_max + ORDER_MARGIN))
+                if bound < results[0][0]:
+                    return
+            
+            i = positions[k]
+            card = hand[i]
+            vector = vectors[i]
+            cards.append(card)
+            coords.extend(vector)
+            phases.append(card.phase)
+            ranks.append(card.rank)
+            suits.append(card.suit)
+            indices.append(card.index)
+            suit_counts[card.suit] = suit_counts.get(card.suit, 0) + 1
+            if multipliers is not None:
+                view.multipliers.append(multipliers[i])
+            
+            child = mask | 1 << i
+            child_base = base + bases[i]
+            child_st = st + vector[0]
+            child_sv = sv + vector[1]
+            child_sc = sc + vector[2]
+            child_sa = sa + vector[3]
+            child_cos = sum_cos + card.cos_phase
+            child_sin = sum_sin + card.sin_phase
+            view.totals = (child_st, child_sv, child_sc, child_sa)
+            view.sum_cos = child_cos
+            view.sum_sin = child_sin
+            
+            score = child_base + _faction_bonus(faction, view, field_state)
+            if n:
+                # As FormationView.mean_centroid_distance / coherence
+                size = n + 1
+                ct, cv, cc, ca = (child_st / size, child_sv / size,
+                                  child_sc / size, child_sa / size)
+                total = 0.0
+                values = iter(coords)
+                for t, v, c, a in zip(values, values, values, values):
+                    total += sqrt((t - ct) ** 2 + (v - cv) ** 2 +
+                                  (c - cc) ** 2 + (a - ca) ** 2)
+                avg_distance = total / size
+                if avg_distance < 1.0:
+                    score += int((1.0 - avg_distance) * 20 * size)
+                score += resonance_for_coherence(
+                    sqrt(child_cos ** 2 + child_sin ** 2) / size)
+                score += chain_bonus_for_indices(indices)
+            
+            if top_k is None:
+                results.append(ScoredPlay(child, score))
+            elif len(results) < top_k:
+                heapq.heappush(results, (score, -child))
+            elif (score, -child) > results[0]:
+                heapq.heapreplace(results, (score, -child))
+            
+            if n + 1 < max_cards:
+                child_bound = child_spread = 0
+                if faction_bounds is not None:
+                    child_bound = mask_bound + card_bounds[i]
+                    child_spread = spread
+                    if n % 2:
+                        # Pair this card with the previous one
+                        child_spread += sqrt((coords[-8] - vector[0]) ** 2 +
+                                             (coords[-7] - vector[1]) ** 2 +
+                                             (coords[-6] - vector[2]) ** 2 +
+                                             (coords[-5] - vector[3]) ** 2)
+                visit(k + 1, child, n + 1, child_base, child_st, child_sv, child_sc,
+                      child_sa, child_cos, child_sin, child_bound, child_spread)
+            
+            # Back to the parent formation
+            cards.pop()
+            del coords[-4:]
+            phases.pop()
+            ranks.pop()
+            suits.pop()
+            indices.pop()
+            if suit_counts[card.suit] == 1:
+                del suit_counts[card.suit]
+            else:
+                suit_counts[card.suit] -= 1
+            if multipliers is not None:
+                view.multipliers.pop()
+    
+    visit(0, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0.0)
+    
+    if top_k is None:
+        return results
+    return [ScoredPlay(-neg_mask, score) for score, neg_mask in sorted(results, reverse=True)]
+
+
 # =============================================================================
 # GAME STATE
 # =============================================================================
@@ -591,17 +1423,161 @@ class FieldState:
     locked_cards: Dict[str, int] = field(default_factory=dict)  # card_id -> turns
 
 
+class Hand(list):
+    """
+    Ordered hand of cards (a list) with O(1) membership.
+    
+    Cards keep their order, since policies and play masks index into it,
+    and reads are plain list operations. A count per dense card index
+    answers `in`, mask is the bitmask of card indices held, and removal
+    finds the position through a parallel list of indices, so no Card
+    comparisons run. Non-standard cards (index -1) fall back to list scans.
+    All mutation goes through the overridden methods below.
+    """
+    __slots__ = ('_ids', '_counts', 'mask')
+    
+    def __init__(self, cards=()):
+        super().__init__()
+        self._ids: List[int] = []
+        self._counts = bytearray(len(CARD_IDS))
+        self.mask = 0
+        self.extend(cards)
+    
+    def append(self, card: Card) -> None:
+        list.append(self, card)
+        self._ids.append(card.index)
+        if card.index >= 0:
+            self._counts[card.index] += 1
+            self.mask |= 1 << card.index
+    
+    def extend(self, cards) -> None:
+        cards = list(cards)
+        ids = [card.index for card in cards]
+        list.extend(self, cards)
+        self._ids.extend(ids)
+        counts = self._counts
+        mask = self.mask
+        for i in ids:
+            if i >= 0:
+                counts[i] += 1
+                mask |= 1 << i
+        self.mask = mask
+    
+    def remove(self, card: Card) -> None:
+        """Remove the first card equal to card (ValueError if absent)."""
+        i = card.index
+        if i < 0:
+            self.pop(list.index(self, card))
+            return
+        counts = self._counts
+        if not counts[i]:
+            raise ValueError(f"{card.card_id} not in hand")
+        position = self._ids.index(i)
+        list.__delitem__(self, position)
+        del self._ids[position]
+        counts[i] -= 1
+        if not counts[i]:
+            self.mask &= ~(1 << i)
+    
+    def pop(self, position: int = -1) -> Card:
+        card = list.pop(self, position)
+        i = self._ids.pop(position)
+        if i >= 0:
+            self._counts[i] -= 1
+            if not self._counts[i]:
+                self.mask &= ~(1 << i)
+        return card
+    
+    def clear(self) -> None:
+        list.clear(self)
+        self._ids.clear()
+        self._counts = bytearray(len(CARD_IDS))
+        self.mask = 0
+    
+    def count(self, card: Card) -> int:
+        if card.index >= 0:
+            return self._counts[card.index]
+        return list.count(self, card)
+    
+    def index(self, card: Card, *args) -> int:
+        if card.index >= 0 and not args:
+            return self._ids.index(card.index)
+        return list.index(self, card, *args)
+    
+    def __contains__(self, card) -> bool:
+        i = card.index
+        if i >= 0:
+            return self._counts[i] > 0
+        return list.__contains__(self, card)
+    
+    def _rebuild(self) -> None:
+        """Recount after an arbitrary in-place edit."""
+        cards = list(self)
+        list.clear(self)
+        self._ids = []
+        self._counts = bytearray(len(CARD_IDS))
+        self.mask = 0
+        self.extend(cards)
+    
+    def insert(self, position: int, card: Card) -> None:
+        list.insert(self, position, card)
+        self._rebuild()
+    
+    def __setitem__(self, key, value) -> None:
+        list.__setitem__(self, key, value)
+        self._rebuild()
+    
+    def __delitem__(self, key) -> None:
+        list.__delitem__(self, key)
+        self._rebuild()
+    
+    def sort(self, *, key=None, reverse: bool = False) -> None:
+        list.sort(self, key=key, reverse=reverse)
+        self._ids = [card.index for card in self]
+    
+    def reverse(self) -> None:
+        list.reverse(self)
+        self._ids.reverse()
+    
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+    
+    def __imul__(self, n):
+        list.__imul__(self, n)
+        self._rebuild()
+        return self
+    
+    def __repr__(self) -> str:
+        return f"Hand({list.__repr__(self)})"
+    
+    def __reduce__(self):
+        return (Hand, (list(self),))
+
+
 @dataclass
 class Player:
-    """Player state."""
+    """
+    Player state. The hand is a Hand, the draw pile a deque (top card at
+    index 0) and the discard pile a list; lists passed in are converted.
+    """
     name: str
     faction: Faction
-    hand: List[Card] = field(default_factory=list)
-    deck: List[Card] = field(default_factory=list)
+    hand: Hand = field(default_factory=Hand)
+    deck: deque = field(default_factory=deque)
     discard: List[Card] = field(default_factory=list)
     score: int = 0
     ability_cooldowns: Dict[str, int] = field(default_factory=dict)
     last_resonance_bonus: int = 0
+    modifiers: ModifierTable = field(default_factory=ModifierTable)
+    # Generator for reshuffles (the engine's; module-level random if unset)
+    rng: Optional[random.Random] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not isinstance(self.hand, Hand):
+            self.hand = Hand(self.hand)
+        if not isinstance(self.deck, deque):
+            self.deck = deque(self.deck)
     
     def draw(self, n: int = 1) -> List[Card]:
         """Draw n cards from deck."""
@@ -609,13 +1585,14 @@ class Player:
         for _ in range(n):
             if not self.deck:
                 if self.discard:
-                    self.deck = self.discard.copy()
+                    deck = self.discard
                     self.discard = []
-                    random.shuffle(self.deck)
+                    (self.rng or random).shuffle(deck)
+                    self.deck = deque(deck)
                 else:
                     self.score -= 5  # Exhaustion penalty
                     break
-            drawn.append(self.deck.pop(0))
+            drawn.append(self.deck.popleft())
         self.hand.extend(drawn)
         return drawn
     
@@ -649,8 +1626,9 @@ class GameState:
     arousal_multiplier: float = 1.0
     score_protected: bool = False
     
-    # Event handlers
+    # Event handlers; emit_events=False skips emission entirely (headless runs)
     _event_handlers: Dict[GameEvent, List[Callable]] = None
+    emit_events: bool = True
     
     def __post_init__(self):
         if self.game_field is None:
@@ -672,14 +1650,14 @@ class GameState:
         self._event_handlers[event].append(handler)
     
     def emit_event(self, event: GameEvent, data: dict) -> None:
+        if not self.emit_events:
+            return
         for handler in self._event_handlers[event]:
             handler(data)
     
     def advance_phase(self) -> None:
         """Move to next phase."""
-        phases = list(TurnPhase)
-        current_idx = phases.index(self.phase)
-        self.phase = phases[(current_idx + 1) % len(phases)]
+        self.phase = NEXT_PHASE[self.phase]
     
     def end_turn(self) -> None:
         """Clean up and pass to next player."""
@@ -693,8 +1671,7 @@ class GameState:
         self.score_protected = False
         
         # Reset card modifiers
-        for card in self.current_player.hand:
-            card.reset_modifiers()
+        self.current_player.modifiers.reset(self.current_player.hand)
         
         # Tick cooldowns
         self.current_player.tick_cooldowns()
@@ -723,15 +1700,214 @@ class GameState:
         return None
 
 
+# =============================================================================
+# PACKED STATE
+# =============================================================================
+
+# FACTIONS key for each faction class
+_FACTION_KEYS = {cls: key for key, cls in FACTIONS.items()}
+
+
+def _pack_cards(cards) -> Tuple[bytes, int]:
+    """Ordered dense indices as bytes, and the bitmask of indices present."""
+    packed = bytes(card.index if card.index >= 0 else 255 for card in cards)
+    if 255 in packed:
+        raise ValueError("Only the 52 standard cards can be packed")
+    mask = 0
+    for i in packed:
+        mask |= 1 << i
+    return packed, mask
+
+
+def _unpack_cards(packed: bytes) -> List[Card]:
+    return [card_from_index(i) for i in packed]
+
+
+class PackedPlayer(NamedTuple):
+    """
+    One player in a PackedState. hand, deck (top card first) and discard
+    are card indices in order, one byte per card; the masks are 52-bit sets
+    of the indices in each zone. cooldowns holds the remaining turns of
+    each faction ability in faction.abilities order (0 = ready), and
+    modifiers (card index, valence, concrete, arousal, score multiplier)
+    per modified card.
+    """
+    name: str
+    faction: str
+    hand: bytes
+    deck: bytes
+    discard: bytes
+    hand_mask: int
+    deck_mask: int
+    discard_mask: int
+    score: int
+    cooldowns: bytes
+    last_resonance_bonus: int
+    modifiers: Tuple[Tuple[int, float, float, float, float], ...]
+
+
+class PackedState(NamedTuple):
+    """
+    Compact immutable encoding of a GameState for search.
+    
+    Everything is ints, floats, strings and bytes in fixed-size tuples, so
+    a state is shared rather than copied and hashes in constant time.
+    last_turn_suits is a 4-bit SUIT_BITS mask and locked_cards (card
+    index, turns) pairs. from_state and to_state convert losslessly for
+    the 52 standard cards and the built-in factions; event handlers and
+    the players' generators are not part of the state.
+    """
+    players: Tuple[PackedPlayer, ...]
+    current_player_idx: int
+    turn_number: int
+    phase: TurnPhase
+    formation: bytes
+    field_cards: bytes
+    last_turn_suits: int
+    locked_cards: Tuple[Tuple[int, int], ...]
+    valence_multiplier: float
+    arousal_multiplier: float
+    score_protected: bool
+    
+    def __copy__(self) -> 'PackedState':
+        return self
+    
+    def __deepcopy__(self, memo) -> 'PackedState':
+        return self
+    
+    @classmethod
+    def from_state(cls, state: 'GameState') -> 'PackedState':
+        players = []
+        for player in state.players:
+            faction_key = _FACTION_KEYS.get(type(player.faction))
+            if faction_key is None:
+                raise ValueError(f"Cannot pack faction {type(player.faction).__name__}")
+            ability_names = [a.name for a in player.faction.abilities]
+            if not set(player.ability_cooldowns) <= set(ability_names):
+                raise ValueError(f"Cooldowns for unknown abilities: {player.ability_cooldowns}")
+            
+            hand, hand_mask = _pack_cards(player.hand)
+            deck, deck_mask = _pack_cards(player.deck)
+            discard, discard_mask = _pack_cards(player.discard)
+            modifiers = []
+            for card_id, mods in player.modifiers._entries.items():
+                if card_id not in CARD_INDEX:
+                    raise ValueError("Only the 52 standard cards can be packed")
+                modifiers.append((CARD_INDEX[card_id], mods.valence, mods.concrete,
+                                  mods.arousal, mods.score_multiplier))
+            
+            players.append(PackedPlayer(
+                name=player.name,
+                faction=faction_key,
+                hand=hand,
+                deck=deck,
+                discard=discard,
+                hand_mask=hand_mask,
+                deck_mask=deck_mask,
+                discard_mask=discard_mask,
+                score=player.score,
+                cooldowns=bytes(player.ability_cooldowns.get(name, 0) for name in ability_names),
+                last_resonance_bonus=player.last_resonance_bonus,
+                modifiers=tuple(modifiers),
+            ))
+        
+        suits = 0
+        for suit in state.game_field.last_turn_suits:
+            suits |= SUIT_BITS[suit]
+        for card_id in state.game_field.locked_cards:
+            if card_id not in CARD_INDEX:
+                raise ValueError("Only the 52 standard cards can be packed")
+        
+        return cls(
+            players=tuple(players),
+            current_player_idx=state.current_player_idx,
+            turn_number=state.turn_number,
+            phase=state.phase,
+            formation=_pack_cards(state.current_formation)[0],
+            field_cards=_pack_cards(state.game_field.all_cards)[0],
+            last_turn_suits=suits,
+            locked_cards=tuple((CARD_INDEX[card_id], turns)
+                               for card_id, turns in state.game_field.locked_cards.items()),
+            valence_multiplier=state.valence_multiplier,
+            arousal_multiplier=state.arousal_multiplier,
+            score_protected=state.score_protected,
+        )
+    
+    def to_state(self, rng: Optional[random.Random] = None,
+                 emit_events: bool = True) -> 'GameState':
+        """A fresh GameState; rng becomes every player's generator."""
+        players = []
+        for packed in self.players:
+            faction = FACTIONS[packed.faction]()
+            modifiers = ModifierTable()
+            for index, valence, concrete, arousal, multiplier in packed.modifiers:
+                modifiers._entries[CARD_IDS[index]] = CardModifiers(
+                    valence, concrete, arousal, multiplier)
+            players.append(Player(
+                name=packed.name,
+                faction=faction,
+                hand=Hand(_unpack_cards(packed.hand)),
+                deck=deque(_unpack_cards(packed.deck)),
+                discard=_unpack_cards(packed.discard),
+                score=packed.score,
+                ability_cooldowns={ability.name: turns for ability, turns
+                                   in zip(faction.abilities, packed.cooldowns) if turns},
+                last_resonance_bonus=packed.last_resonance_bonus,
+                modifiers=modifiers,
+                rng=rng,
+            ))
+        
+        return GameState(
+            players=players,
+            current_player_idx=self.current_player_idx,
+            turn_number=self.turn_number,
+            phase=self.phase,
+            game_field=FieldState(
+                all_cards=_unpack_cards(self.field_cards),
+                last_turn_suits={suit for suit, bit in SUIT_BITS.items()
+                                 if self.last_turn_suits & bit},
+                locked_cards={CARD_IDS[index]: turns for index, turns in self.locked_cards},
+            ),
+            current_formation=_unpack_cards(self.formation),
+            valence_multiplier=self.valence_multiplier,
+            arousal_multiplier=self.arousal_multiplier,
+            score_protected=self.score_protected,
+            emit_events=emit_events,
+        )
+
+
 # =============================================================================
 # GAME ENGINE
 # =============================================================================
 
+# Default deck per faction suit, built on first use
+_DEFAULT_DECKS: Dict[str, Tuple[Card, ...]] = {}
+
+
 class GameEngine:
-    """Main game controller."""
+    """
+    Main game controller.
     
-    def __init__(self):
+    score_cache, if given, memoizes formation scores (see ScoreCache);
+    scores are identical either way. emit_events=False runs games without
+    emitting any events (see GameState.emit_events).
+    
+    All shuffling (setup and reshuffles) and stochastic policies draw from
+    self.rng: the given random.Random, else a new one seeded with seed, else
+    the module-level generator. A seeded engine replays the same game.
+    """
+    
+    def __init__(self, score_cache: Optional[ScoreCache] = None,
+                 emit_events: bool = True, rng: Optional[random.Random] = None,
+                 seed: Optional[int] = None):
+        if rng is not None and seed is not None:
+            raise ValueError("Pass either rng or seed, not both")
         self.state: Optional[GameState] = None
+        self.score_cache = score_cache
+        self.emit_events = emit_events
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self.rng = rng if rng is not None else random
     
     def setup(self, player_names: List[str], faction_names: List[str],
               decks: Optional[List[List[str]]] = None) -> None:
@@ -746,18 +1922,20 @@ class GameEngine:
                 raise ValueError(f"Unknown faction: {faction_name}")
             
             faction = faction_class()
-            player = Player(name=name, faction=faction)
+            player = Player(name=name, faction=faction,
+                            rng=self.rng if self.rng is not random else None)
             
-            # Build deck
-            if decks and i < len(decks):
-                player.deck = [create_card(cid) for cid in decks[i]]
+            # Build deck (a None entry means the default deck)
+            if decks and i < len(decks) and decks[i] is not None:
+                deck = [create_card(cid) for cid in decks[i]]
             else:
-                player.deck = self._generate_default_deck(faction)
+                deck = self._generate_default_deck(faction)
             
-            random.shuffle(player.deck)
+            self.rng.shuffle(deck)
+            player.deck = deque(deck)
             players.append(player)
         
-        self.state = GameState(players=players)
+        self.state = GameState(players=players, emit_events=self.emit_events)
         
         # Initial draw
         for player in self.state.players:
@@ -769,6 +1947,10 @@ class GameEngine:
     
     def _generate_default_deck(self, faction: Faction) -> List[Card]:
         """Generate a basic legal deck for a faction."""
+        cached = _DEFAULT_DECKS.get(faction.suit)
+        if cached is not None:
+            return list(cached)
+        
         deck = []
         
         # Add faction cards (10)
@@ -782,6 +1964,8 @@ class GameEngine:
             for sym in ['A', '5', '7', '10']:
                 deck.append(create_card(f"{sym}{suit}"))
         
+        # Cards are immutable and interned, so the list can be reused
+        _DEFAULT_DECKS[faction.suit] = tuple(deck)
         return deck
     
     def execute_draw(self) -> List[Card]:
@@ -837,7 +2021,12 @@ class GameEngine:
         cards = self.state.current_formation
         player = self.state.current_player
         
-        breakdown = calculate_full_score(cards, player.faction, self.state.game_field)
+        if self.score_cache is not None:
+            breakdown = self.score_cache.score(cards, player.faction, self.state.game_field,
+                                               player.modifiers)
+        else:
+            breakdown = calculate_full_score(cards, player.faction, self.state.game_field,
+                                             player.modifiers)
         
         # Apply multipliers
         # (Would modify breakdown based on state multipliers)
@@ -865,14 +2054,18 @@ class GameEngine:
             raise ValueError("Not in discard phase")
         
         player = self.state.current_player
-        discarded = []
-        
-        while len(player.hand) > DECK_RULES['hand_limit']:
-            # Auto-discard lowest rank (AI) or prompt player (UI)
-            lowest = min(player.hand, key=lambda c: c.rank)
-            player.hand.remove(lowest)
-            player.discard.append(lowest)
-            discarded.append(lowest)
+        hand = player.hand
+        excess = len(hand) - DECK_RULES['hand_limit']
+        if excess <= 0:
+            return []
+        
+        # Auto-discard lowest rank (AI) or prompt player (UI): one sort picks
+        # the excess lowest ranks, earliest in hand first on ties
+        positions = sorted(range(len(hand)), key=lambda p: (hand[p].rank, p))[:excess]
+        discarded = [hand[p] for p in positions]
+        for card in discarded:
+            hand.remove(card)
+            player.discard.append(card)
         
         return discarded
     
@@ -917,25 +2110,28 @@ class GameEngine:
         return success
     
     def get_valid_plays(self) -> List[List[Card]]:
-        """Get all valid card combinations from current hand."""
+        """Get all valid card combinations from current hand (see valid_play_masks)."""
         hand = self.state.current_player.hand
-        valid = []
-        
-        # Single cards
-        for card in hand:
-            if card.card_id not in self.state.game_field.locked_cards:
-                valid.append([card])
-        
-        # Pairs
-        for i, card1 in enumerate(hand):
-            for card2 in hand[i+1:]:
-                if (card1.card_id not in self.state.game_field.locked_cards and
-                    card2.card_id not in self.state.game_field.locked_cards):
-                    valid.append([card1, card2])
-        
-        # Could extend to larger combinations...
-        
-        return valid
+        return [cards_for_mask(hand, mask) for mask in self.valid_play_masks()]
+    
+    def valid_play_masks(self) -> List[int]:
+        """
+        Every non-empty subset of the unlocked hand cards as a bitmask
+        (bit i = hand[i]), smallest formations first.
+        """
+        playable = playable_mask(self.state.current_player.hand,
+                                 self.state.game_field.locked_cards)
+        positions = [i for i in range(playable.bit_length()) if playable >> i & 1]
+        return [sum(1 << i for i in combo)
+                for size in range(1, len(positions) + 1)
+                for combo in combinations(positions, size)]
+    
+    def score_plays(self, top_k: Optional[int] = None,
+                    max_cards: Optional[int] = None) -> List[ScoredPlay]:
+        """Scored legal plays for the current player (see enumerate_plays)."""
+        player = self.state.current_player
+        return enumerate_plays(player.hand, player.faction, self.state.game_field,
+                               player.modifiers, top_k=top_k, max_cards=max_cards)
 
 
 # =============================================================================
@@ -950,10 +2146,19 @@ def main():
     parser.add_argument('--players', type=int, default=2, help='Number of players')
     parser.add_argument('--faction1', type=str, default='spades')
     parser.add_argument('--faction2', type=str, default='hearts')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed (replays a game)')
+    parser.add_argument('--save-coupling-table', type=str, default=None,
+                        help=f'Write the coupling table to this file and exit '
+                             f'(load it via {COUPLING_TABLE_ENV})')
     
     args = parser.parse_args()
     
-    engine = GameEngine()
+    if args.save_coupling_table:
+        get_coupling_network().save(args.save_coupling_table)
+        print(f"Coupling table written to: {args.save_coupling_table}")
+        return
+    
+    engine = GameEngine(seed=args.seed)
     engine.setup(
         player_names=['Player 1', 'Player 2'],
         faction_names=[args.faction1, args.faction2],
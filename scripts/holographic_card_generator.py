@@ -24,6 +24,7 @@ Rosetta Bear Coordinates:
 
 import json
 import math
+import sys
 import base64
 import zlib
 from dataclasses import dataclass, field
@@ -130,7 +131,11 @@ def calculate_card_gradient(suit: str, rank: int) -> List[str]:
 # 4D COORDINATE SYSTEM
 # ============================================================================
 
-@dataclass
+# __slots__ for the small value types where dataclasses support it (3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Coordinate4D:
     """4D tesseract coordinate for holographic positioning."""
     temporal: float = 0.0   # Past (-1) to Future (+1)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+MCTS Bot - Information-set Monte Carlo tree search player
+=========================================================
+An AI opponent for balance testing. MCTSBot is a batch_simulator policy:
+called in the current player's main phase it searches for the best
+formation under an iteration and/or wall-clock budget and returns it.
+
+The search is single-observer ISMCTS. Each iteration determinizes the
+hidden information (the opponents' hands and every deck's order; deck
+lists are treated as public, as with the default and prebuilt decks),
+descends a tree of formations keyed by the cards played, and finishes
+the game with fast rollouts up to a turn horizon. Candidate formations
+at each decision are the top-k of enumerate_plays. Rewards are 1 for a
+win and 0 for a loss; games still running at the horizon score by the
+change in score margin since the root.
+
+Under the default rules a full opening hand usually clears win_score on
+the first turn, and the bot plays a winning formation without searching;
+cap formations with max_cards (on both seats, see
+batch_simulator.capped_policy) for games where search matters. The CLI
+defaults to two cards.
+
+Searching never touches the real engine's state; it takes a single draw
+from engine.rng to seed its own generator, so seeded batches stay
+reproducible for a fixed iteration budget.
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from batch_simulator import Policy, capped_policy, play_turn
+from game_engine import (
+    DECK_RULES, Card, GameEngine, GameState, Hand, PackedState, TurnPhase, cards_for_mask
+)
+
+
+# =============================================================================
+# SEARCH TREE
+# =============================================================================
+
+# A formation is identified across determinizations by the sorted indices
+# of its cards, one byte each
+ActionKey = bytes
+
+
+def action_key(hand: Sequence[Card], mask: int) -> ActionKey:
+    """Key of the formation of hand cards selected by mask."""
+    return bytes(sorted(card.index for card in cards_for_mask(hand, mask)))
+
+
+class _Node:
+    """
+    A tree node: the formation that led here, played by seat. total is
+    the sum of rewards from seat's point of view, avail the number of
+    visits to the parent in which this formation was legal.
+    """
+    __slots__ = ('seat', 'children', 'visits', 'avail', 'total')
+
+    def __init__(self, seat: int):
+        self.seat = seat
+        self.children: Dict[ActionKey, '_Node'] = {}
+        self.visits = 0
+        self.avail = 0
+        self.total = 0.0
+
+
+@dataclass
+class SearchStats:
+    """Iterations and time spent by one or more searches."""
+    searches: int = 0
+    iterations: int = 0
+    elapsed: float = 0.0
+
+    def add(self, iterations: int, elapsed: float) -> None:
+        self.searches += 1
+        self.iterations += iterations
+        self.elapsed += elapsed
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# =============================================================================
+# BOT
+# =============================================================================
+
+class MCTSBot:
+    """
+    ISMCTS policy; call it as bot(engine) in the main phase.
+
+    The budget is iterations per move, time_limit seconds per move, or
+    both (whichever runs out first). candidates caps the formations
+    considered at each decision (the highest-scoring ones) and max_cards
+    their size, for every seat in the simulations. rollout is the policy
+    played after the tree (a policy or POLICIES name, capped to max_cards;
+    default: the highest-scoring formation of at most max_cards cards),
+    for up to horizon turns past the root in total.
+    reward_scale is the margin change (in points) worth about 0.38 of
+    the reward above or below an even result at the horizon.
+
+    last_search holds the stats of the latest move, stats the totals.
+    """
+
+    def __init__(self, iterations: Optional[int] = None, time_limit: Optional[float] = None,
+                 candidates: int = 8, max_cards: Optional[int] = None,
+                 rollout=None, horizon: int = 8, exploration: float = 0.7,
+                 reward_scale: float = 50.0):
+        if iterations is None and time_limit is None:
+            raise ValueError("Give an iteration budget, a time limit, or both")
+        if iterations is not None and iterations < 1:
+            raise ValueError("iterations must be at least 1")
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("time_limit must be positive")
+        if candidates < 1:
+            raise ValueError("candidates must be at least 1")
+        if horizon < 1:
+            raise ValueError("horizon must be at least 1")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.candidates = candidates
+        self.max_cards = max_cards
+        self.rollout: Optional[Policy] = (capped_policy(rollout, max_cards)
+                                          if rollout is not None else None)
+        self.horizon = horizon
+        self.exploration = exploration
+        self.reward_scale = reward_scale
+        self.last_search = SearchStats()
+        self.stats = SearchStats()
+        # Policy name in batch statistics
+        self.__name__ = 'mcts'
+
+    def __call__(self, engine: GameEngine) -> List[Card]:
+        state = engine.state
+        if state.phase != TurnPhase.MAIN:
+            raise ValueError("MCTSBot plays in the main phase")
+        player = state.current_player
+        hand = player.hand
+
+        scored = engine.score_plays(top_k=self.candidates, max_cards=self.max_cards)
+        if not scored:
+            return []
+        # Nothing to search with one option or a winning one
+        if len(scored) == 1 or player.score + scored[0].score >= DECK_RULES['win_score']:
+            self._record(0, 0.0)
+            return cards_for_mask(hand, scored[0].mask)
+
+        plays = [(action_key(hand, play.mask), play.mask) for play in scored]
+        root = _Node(seat=-1)
+        rng = random.Random(engine.rng.getrandbits(64))
+        self._search(root, plays, PackedState.from_state(state), rng)
+
+        # Most visited formation, the higher-scoring one on ties
+        best = max(plays, key=lambda play: root.children[play[0]].visits
+                   if play[0] in root.children else -1)
+        return cards_for_mask(hand, best[1])
+
+    def _candidates(self, engine: GameEngine) -> List[Tuple[ActionKey, int]]:
+        """(key, hand mask) of the top formations, highest score first."""
+        hand = engine.state.current_player.hand
+        return [(action_key(hand, play.mask), play.mask)
+                for play in engine.score_plays(top_k=self.candidates, max_cards=self.max_cards)]
+
+    def _record(self, iterations: int, elapsed: float) -> None:
+        self.last_search = SearchStats()
+        self.last_search.add(iterations, elapsed)
+        self.stats.add(iterations, elapsed)
+
+    def _search(self, root: _Node, plays: List[Tuple[ActionKey, int]], packed: PackedState,
+                rng: random.Random) -> None:
+        root_seat = packed.current_player_idx
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else None
+        sim = GameEngine(emit_events=False, rng=rng)
+
+        iterations = 0
+        while self.iterations is None or iterations < self.iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            sim.state = packed.to_state(rng=rng, emit_events=False)
+            determinize(sim.state, root_seat, rng)
+            self._iterate(root, plays, sim, [p.score for p in sim.state.players])
+            iterations += 1
+
+        self._record(iterations, time.perf_counter() - start)
+
+    def _iterate(self, root: _Node, root_plays: List[Tuple[ActionKey, int]], sim: GameEngine,
+                 root_scores: List[int]) -> None:
+        """
+        One selection, expansion, rollout and backpropagation pass.
+
+        root_plays are the root candidates; determinization leaves the root
+        player's hand and the field alone, so they hold in every simulation.
+        """
+        state = sim.state
+        path = [root]
+        node = root
+        winner = None
+        turns = 0
+
+        # Selection and expansion
+        expanded = False
+        while not expanded and turns < self.horizon:
+            if state.phase == TurnPhase.DRAW:
+                sim.execute_draw()
+            plays = root_plays if node is root else self._candidates(sim)
+            seat = state.current_player_idx
+
+            untried = None
+            best, best_value = None, -1.0
+            for key, mask in plays:
+                child = node.children.get(key)
+                if child is None:
+                    if untried is None:
+                        untried = (key, mask)
+                    continue
+                child.avail += 1
+                if untried is None:
+                    value = (child.total / child.visits
+                             + self.exploration * math.sqrt(math.log(child.avail) / child.visits))
+                    if value > best_value:
+                        best, best_value = (key, mask), value
+
+            if untried is not None:
+                key, mask = untried
+                child = _Node(seat)
+                child.avail = 1
+                node.children[key] = child
+                expanded = True
+            elif best is not None:
+                key, mask = best
+                child = node.children[key]
+            else:
+                key, mask, child = None, 0, None
+
+            cards = cards_for_mask(state.current_player.hand, mask)
+            winner = play_turn(sim, cards)
+            turns += 1
+            if child is None:
+                break
+            node = child
+            path.append(node)
+            if winner:
+                break
+
+        # Rollout
+        while not winner and turns < self.horizon:
+            if state.phase == TurnPhase.DRAW:
+                sim.execute_draw()
+            winner = play_turn(sim, self._rollout_play(sim))
+            turns += 1
+
+        # Backpropagation
+        rewards = self._rewards(state, root_scores, winner)
+        for node in path[1:]:
+            node.visits += 1
+            node.total += rewards[node.seat]
+
+    def _rollout_play(self, sim: GameEngine) -> List[Card]:
+        if self.rollout is not None:
+            return self.rollout(sim)
+        best = sim.score_plays(top_k=1, max_cards=self.max_cards)
+        if not best:
+            return []
+        return cards_for_mask(sim.state.current_player.hand, best[0].mask)
+
+    def _rewards(self, state: GameState, root_scores: List[int], winner) -> List[float]:
+        """Reward per seat: win/loss, else squashed margin change since the root."""
+        if winner:
+            return [1.0 if player is winner else 0.0 for player in state.players]
+        gains = [player.score - score for player, score in zip(state.players, root_scores)]
+        rewards = []
+        for seat, gain in enumerate(gains):
+            margin = gain - max(g for other, g in enumerate(gains) if other != seat)
+            rewards.append(0.5 + 0.5 * math.tanh(margin / self.reward_scale))
+        return rewards
+
+
+def determinize(state: GameState, observer: int, rng: random.Random) -> None:
+    """
+    Resample what observer cannot see: every other player's hand and deck
+    are redealt from their combined cards, and every deck is shuffled.
+    """
+    for seat, player in enumerate(state.players):
+        if seat == observer:
+            rng.shuffle(player.deck)
+            continue
+        hidden = list(player.hand) + list(player.deck)
+        rng.shuffle(hidden)
+        size = len(player.hand)
+        player.hand = Hand(hidden[:size])
+        player.deck.clear()
+        player.deck.extend(hidden[size:])
+
+
+# =============================================================================
+# CLI INTERFACE
+# =============================================================================
+
+def main():
+    import argparse
+
+    from batch_simulator import POLICIES, BatchStats, print_summary, simulate
+
+    parser = argparse.ArgumentParser(
+        description='MCTS bot against a baseline policy, from both seats; '
+                    'both seats play formations of at most --max-cards cards')
+    parser.add_argument('--games', type=int, default=50, help='Games per seat order')
+    parser.add_argument('--factions', nargs=2, default=['spades', 'hearts'],
+                        help='Faction of the bot and of the opponent')
+    parser.add_argument('--opponent', type=str, default='random',
+                        help=f'Opponent policy: {", ".join(POLICIES)}, or mcts')
+    parser.add_argument('--iterations', type=int, default=None, help='Iterations per move')
+    parser.add_argument('--time-limit', type=float, default=None,
+                        help='Seconds per move (default 0.05 without --iterations)')
+    parser.add_argument('--candidates', type=int, default=8,
+                        help='Formations considered per decision')
+    parser.add_argument('--max-cards', type=int, default=2,
+                        help='Largest formation for both seats (0 = no cap; an uncapped '
+                             'opening hand usually wins on turn one, leaving nothing to search)')
+    parser.add_argument('--horizon', type=int, default=8, help='Turns simulated per iteration')
+    parser.add_argument('--max-turns', type=int, default=50, help='Turn limit per game')
+    parser.add_argument('--seed', type=int, default=0, help='Batch seed')
+
+    args = parser.parse_args()
+
+    time_limit = args.time_limit
+    if args.iterations is None and time_limit is None:
+        time_limit = 0.05
+    max_cards = args.max_cards or None
+
+    def make_bot():
+        return MCTSBot(iterations=args.iterations, time_limit=time_limit,
+                       candidates=args.candidates, max_cards=max_cards,
+                       horizon=args.horizon)
+
+    try:
+        bot = make_bot()
+        opponent = (make_bot() if args.opponent == 'mcts'
+                    else capped_policy(args.opponent, max_cards))
+    except ValueError as e:
+        parser.error(str(e))
+
+    bot_wins = 0
+    for seat in (0, 1):
+        factions = args.factions if seat == 0 else args.factions[::-1]
+        policies = [bot, opponent] if seat == 0 else [opponent, bot]
+        stats: BatchStats = simulate(args.games, factions, policies,
+                                     max_turns=args.max_turns, seed=args.seed + seat)
+        print(f"\nBot in seat {seat + 1}:")
+        print_summary(stats)
+        bot_wins += stats.wins[seat]
+
+    search = bot.stats
+    print(f"\nbot won {bot_wins}/{2 * args.games} games; {search.searches} searches, "
+          f"{search.iterations} iterations, {search.iterations_per_second:,.0f} iterations/s, "
+          f"{search.elapsed / search.searches * 1000 if search.searches else 0:.1f} ms/move")
+
+
+if __name__ == '__main__':
+    main()
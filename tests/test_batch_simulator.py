@@ -0,0 +1,26 @@
+"""Tests for the batch simulator tournament."""
+
+import batch_simulator as bs
+
+
+def test_mirror_diagonal_is_first_seat_rate():
+    entrants = bs.build_entrants(['spades', 'hearts'], ['default'], native=False)
+    games = 40
+    result = bs.run_tournament(entrants, games=games, policy='first3', max_turns=2,
+                               workers=1, chunk_size=games, progress=False)
+
+    # Matchup numbers follow (0, 0), (0, 1), (1, 1); replay the mirrors
+    policies = [bs.get_policy('first3')] * 2
+    for i, number in ((0, 0), (1, 2)):
+        first_wins = draws = 0
+        for game in range(number * games, (number + 1) * games):
+            outcome = bs.play_game([entrants[i].faction] * 2, policies, max_turns=2,
+                                   seed=bs.game_seed(0, game))
+            first_wins += outcome.winner == 0
+            draws += outcome.winner is None
+        assert result.wins[i][i] == first_wins
+        assert result.win_rate(i, i) == (first_wins + 0.5 * draws) / games
+
+    assert result.total_draws > 0
+    decided = result.total_games - result.total_draws
+    assert result.first_seat_win_rate == result.first_wins / decided
@@ -0,0 +1,187 @@
+"""Tests for game_engine cards, scoring and chain solving."""
+
+import dataclasses
+import itertools
+import random
+
+import pytest
+
+import game_engine as ge
+
+
+def test_card_coordinate_is_read_only():
+    card = ge.create_card('7H')
+    with pytest.raises(AttributeError):
+        card.coordinate.valence = 5.0
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        card.coordinate = ge.CardCoordinate(0.0, 0.0, 0.0, 0.0)
+    assert card.vector == tuple(card.coordinate)
+
+
+def test_optimal_chain_order_is_best_playable_order():
+    rng = random.Random(7)
+    faction = ge.FACTIONS['spades']()
+    field_state = ge.FieldState()
+    for _ in range(200):
+        cards = [ge.create_card(c) for c in rng.sample(ge.CARD_IDS, rng.randint(2, 5))]
+        order = ge.optimal_chain_order(cards)
+        assert sorted(order, key=cards.index) == cards
+
+        played = ge.score_formation(order, faction, field_state).chain
+        best_playable = max(ge.chain_bonus_for_indices([c.index for c in p])
+                            for p in itertools.permutations(cards))
+        assert played == best_playable
+        assert played <= ge.optimal_chain([c.index for c in cards])[0]
+
+
+def test_hand_stays_indexed_after_sort_and_reverse():
+    king, two, seven = (ge.create_card(c) for c in ('KS', '2H', '7D'))
+    hand = ge.Hand([king, two, seven])
+    hand.sort(key=lambda card: card.rank)
+    assert hand == [two, seven, king]
+    hand.remove(two)
+    assert hand == [seven, king]
+
+    hand = ge.Hand([king, two, seven])
+    hand.reverse()
+    hand.remove(seven)
+    assert hand == [two, king]
+    assert hand.index(king) == 1
+    assert seven not in hand and hand.mask == (1 << king.index) | (1 << two.index)
+
+
+def _reference_score(cards, faction, field_state, modifiers=None):
+    """Total from the per-component scoring functions."""
+    return (ge.calculate_base_score(cards, modifiers)
+            + ge.calculate_cluster_bonus(cards, modifiers)
+            + ge.calculate_chain_bonus(cards)
+            + ge.calculate_resonance_bonus(cards)
+            + faction.calculate_bonus(cards, field_state))
+
+
+def test_score_formation_matches_reference_scorer():
+    rng = random.Random(16)
+    for _ in range(500):
+        faction = ge.FACTIONS[rng.choice(sorted(ge.FACTIONS))]()
+        field_state = ge.FieldState(last_turn_suits=set(rng.sample('SHDC', rng.randint(0, 4))))
+        cards = [ge.create_card(c) for c in rng.choices(ge.CARD_IDS, k=rng.randint(1, 7))]
+        modifiers = None
+        if rng.random() < 0.5:
+            modifiers = ge.ModifierTable()
+            for card in rng.sample(cards, rng.randint(1, len(cards))):
+                modifiers.modify(card, rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5),
+                                 rng.uniform(-0.5, 0.5), rng.choice((0.5, 1.0, 1.5, 2.0)))
+
+        breakdown = ge.score_formation(cards, faction, field_state, modifiers)
+        assert breakdown.base == ge.calculate_base_score(cards, modifiers)
+        assert breakdown.chain == ge.calculate_chain_bonus(cards)
+        assert breakdown.total == _reference_score(cards, faction, field_state, modifiers)
+
+
+def test_score_cache_matches_uncached_scores():
+    rng = random.Random(17)
+    cache = ge.ScoreCache(maxsize=64)
+    pool = [[ge.create_card(c) for c in rng.choices(ge.CARD_IDS, k=rng.randint(1, 6))]
+            for _ in range(100)]
+    for _ in range(2000):
+        # Reordered repeats share a multiset entry but not a chain entry
+        cards = list(rng.choice(pool))
+        rng.shuffle(cards)
+        faction = ge.FACTIONS[rng.choice(sorted(ge.FACTIONS))]()
+        field_state = ge.FieldState(last_turn_suits=set(rng.sample('SHDC', rng.randint(0, 2))))
+        modifiers = None
+        if rng.random() < 0.1:
+            modifiers = ge.ModifierTable()
+            modifiers.modify(cards[0], valence=0.3, score_multiplier=2.0)
+
+        cached = cache.score(cards, faction, field_state, modifiers)
+        assert cached == ge.score_formation(cards, faction, field_state, modifiers)
+
+    stats = cache.stats()
+    assert stats['hits'] and stats['chain_hits'] and stats['evictions'] and stats['bypasses']
+
+
+def test_enumerate_plays_top_k_matches_exhaustive_search():
+    rng = random.Random(19)
+    for _ in range(60):
+        faction = ge.FACTIONS[rng.choice(sorted(ge.FACTIONS))]()
+        hand = [ge.create_card(c) for c in rng.choices(ge.CARD_IDS, k=rng.randint(1, 9))]
+        field_state = ge.FieldState(
+            last_turn_suits=set(rng.sample('SHDC', rng.randint(0, 2))),
+            locked_cards={card.card_id: 1 for card in rng.sample(hand, rng.randint(0, 2))})
+        modifiers = None
+        if rng.random() < 0.3:
+            modifiers = ge.ModifierTable()
+            modifiers.modify(rng.choice(hand), concrete=-0.4, score_multiplier=1.5)
+        top_k = rng.randint(1, 10)
+        max_cards = rng.choice((None, 1, 2, 3, 5))
+
+        playable = [i for i, card in enumerate(hand)
+                    if card.card_id not in field_state.locked_cards]
+        exhaustive = []
+        for size in range(1, len(playable) + 1):
+            if max_cards is not None and size > max_cards:
+                break
+            for combo in itertools.combinations(playable, size):
+                mask = sum(1 << i for i in combo)
+                cards = ge.cards_for_mask(hand, mask)
+                exhaustive.append(ge.ScoredPlay(
+                    mask, ge.score_formation(cards, faction, field_state, modifiers).total))
+        exhaustive.sort(key=lambda play: (-play.score, play.mask))
+
+        plays = ge.enumerate_plays(hand, faction, field_state, modifiers,
+                                   top_k=top_k, max_cards=max_cards)
+        assert plays == exhaustive[:top_k]
+
+
+def _play_best_turn(engine):
+    """Draw if due, then play the best formation of at most two cards."""
+    state = engine.state
+    if state.phase == ge.TurnPhase.DRAW:
+        engine.execute_draw()
+    best = engine.score_plays(top_k=1, max_cards=2)
+    engine.play_cards(ge.cards_for_mask(state.current_player.hand, best[0].mask) if best else [])
+    state.advance_phase()
+    engine.calculate_score()
+    state.advance_phase()
+    engine.enforce_hand_limit()
+    state.advance_phase()
+    engine.end_turn()
+
+
+def test_packed_state_round_trip_after_turns():
+    engine = ge.GameEngine(emit_events=False, rng=random.Random(24))
+    engine.setup(['Ada', 'Bo'], ['spades', 'hearts'])
+    for _ in range(5):
+        _play_best_turn(engine)
+    state = engine.state
+    player, opponent = state.current_player, state.players[1 - state.current_player_idx]
+    player.ability_cooldowns[player.faction.abilities[0].name] = 2
+    player.modifiers.modify(player.hand[0], valence=0.25, score_multiplier=1.5)
+    state.game_field.locked_cards[opponent.hand[0].card_id] = 2
+
+    packed = ge.PackedState.from_state(state)
+    restored = packed.to_state(emit_events=False)
+    assert ge.PackedState.from_state(restored) == packed
+    assert hash(ge.PackedState.from_state(restored)) == hash(packed)
+    assert restored.current_player_idx == state.current_player_idx
+    assert restored.turn_number == state.turn_number and restored.phase == state.phase
+    assert restored.game_field.all_cards == state.game_field.all_cards
+    assert restored.game_field.locked_cards == state.game_field.locked_cards
+    assert restored.game_field.last_turn_suits == state.game_field.last_turn_suits
+    for before, after in zip(state.players, restored.players):
+        assert after.hand == before.hand and list(after.deck) == list(before.deck)
+        assert after.discard == before.discard
+        assert after.score == before.score
+        assert after.ability_cooldowns == before.ability_cooldowns
+        assert after.modifiers._entries == before.modifiers._entries
+
+    # The restored state plays on exactly like the original
+    rng = random.Random()
+    rng.setstate(engine.rng.getstate())
+    sim = ge.GameEngine(emit_events=False, rng=rng)
+    sim.state = packed.to_state(rng=rng, emit_events=False)
+    for _ in range(4):
+        _play_best_turn(engine)
+        _play_best_turn(sim)
+        assert ge.PackedState.from_state(sim.state) == ge.PackedState.from_state(engine.state)
@@ -0,0 +1,17 @@
+"""Tests for the MCTS bot."""
+
+import batch_simulator as bs
+import mcts_bot
+
+
+def test_bot_searches_and_beats_random_with_capped_formations():
+    bot = mcts_bot.MCTSBot(iterations=30, max_cards=2)
+    opponent = bs.capped_policy('random', 2)
+
+    as_first = bs.simulate(10, ['spades', 'spades'], [bot, opponent], seed=0)
+    as_second = bs.simulate(10, ['spades', 'spades'], [opponent, bot], seed=1)
+
+    assert bot.stats.iterations > 0
+    bot_wins = as_first.wins[0] + as_second.wins[1]
+    opponent_wins = as_first.wins[1] + as_second.wins[0]
+    assert bot_wins > opponent_wins
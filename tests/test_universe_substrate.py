@@ -0,0 +1,200 @@
+"""Tests for universe_substrate sweeps, integrators and history."""
+
+import json
+
+import numpy as np
+import pytest
+
+import universe_substrate as us
+
+
+def test_sweep_resume_key_covers_run_options(tmp_path):
+    results = tmp_path / 'results.jsonl'
+    tasks = us.sweep_grid([1], [5], [0.1], [1.0])
+    lattice = {'engine': 'array', 'decks': 1}
+
+    assert us.run_sweep(tasks, str(results), workers=1, options=lattice, progress=False) == 1
+    assert us.run_sweep(tasks, str(results), workers=1, options=lattice, progress=False) == 0
+    rk4 = {**lattice, 'integrator': 'rk4'}
+    assert us.run_sweep(tasks, str(results), workers=1, options=rk4, progress=False) == 1
+
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert [r['options']['integrator'] for r in records] == ['euler', 'rk4']
+    assert records[0]['key'] != records[1]['key']
+
+
+def _rk45_lattice(**kwargs):
+    universe = us.UniverseSubstrate(seed=1, engine='array', integrator='rk45', **kwargs)
+    universe.build_lattice(1)
+    return universe
+
+
+def test_rk45_rejects_non_finite_error():
+    universe = _rk45_lattice()
+    universe._ensure_array_engine().natural_frequencies[0] = float('nan')
+    with pytest.raises(FloatingPointError):
+        universe.run(1)
+
+
+def test_rk45_rejects_unreachable_tolerances():
+    universe = _rk45_lattice(rtol=0.0, atol=1e-30)
+    with pytest.raises(RuntimeError):
+        universe.run(1)
+
+
+def test_sweep_passes_rk45_tolerances(tmp_path):
+    results = tmp_path / 'results.jsonl'
+    tasks = us.sweep_grid([1], [5], [0.5], [1.0])
+    options = {'engine': 'array', 'decks': 1, 'integrator': 'rk45'}
+
+    us.run_sweep(tasks, str(results), workers=1, options=options, progress=False)
+    us.run_sweep(tasks, str(results), workers=1, progress=False,
+                 options={**options, 'rtol': 1e-10, 'atol': 1e-12})
+
+    loose, tight = [json.loads(line) for line in results.read_text().splitlines()]
+    assert tight['options']['rtol'] == 1e-10
+    assert (tight['integrator_stats']['accepted_steps']
+            > loose['integrator_stats']['accepted_steps'])
+
+
+def test_agent_accepts_activation_history():
+    agent = us.Agent('AS', 'S', 1, us.StateVector4D(0.0, 0.0, 0.0, 0.0),
+                     phase=0.0, natural_frequency=1.0, coupling_strength=1.0,
+                     activation_history=[1.0, 2.0, 3.0])
+    assert agent.activation_history == [1.0, 2.0, 3.0]
+    assert agent.get_state_snapshot()['avg_activation'] == 2.0
+    agent.advance(-4.0)
+    assert agent.activation_history == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_stream_bounds_history(tmp_path):
+    universe = us.UniverseSubstrate(seed=1, engine='array')
+    universe.build_lattice(1)
+    universe.open_stream(str(tmp_path / 'metrics.ums'), chunk_size=64)
+    cycles = us.STREAM_HISTORY_LIMIT + 200
+    universe.run(cycles)
+    universe.close_stream()
+
+    assert len(universe.history) == us.STREAM_HISTORY_LIMIT
+    assert us.STREAM_HISTORY_LIMIT >= us.ATTRACTOR_LOOKBACK
+    assert len(us.read_metrics_stream(str(tmp_path / 'metrics.ums'))['cycle']) == cycles
+
+
+def _phase_gap(a, b):
+    return float(np.abs(np.angle(np.exp(1j * (a - b)))).max())
+
+
+def _lattice_run(seed, cycles, dt, jitter, scale, integrator='euler'):
+    universe = us.UniverseSubstrate(seed=seed, engine='array', integrator=integrator)
+    universe.build_lattice(1)
+    universe.jitter_phases(jitter)
+    universe.scale_coupling(scale)
+    universe.run(cycles, dt=dt)
+    return universe
+
+
+def test_ensemble_member_matches_single_run():
+    template = us.UniverseSubstrate(seed=3, engine='array')
+    template.build_lattice(1)
+    members = [us.EnsembleMember(seed=3, dt=0.05, coupling_scale=0.8, phase_jitter=0.5),
+               us.EnsembleMember(seed=9, dt=0.1, coupling_scale=1.5, phase_jitter=1.0)]
+    ensemble = us.UniverseEnsemble(template, members)
+    ensemble.run(200)
+
+    for b, member in enumerate(members):
+        single = _lattice_run(member.seed, 200, member.dt, member.phase_jitter,
+                              member.coupling_scale)
+        assert _phase_gap(ensemble.phases[b], single._array_engine.phases) < 1e-9
+        assert ensemble.histories[b][-1].order_parameter == pytest.approx(
+            single.history[-1].order_parameter, abs=1e-6)
+
+
+def test_ensemble_uses_template_integrator():
+    template = us.UniverseSubstrate(seed=3, engine='array', integrator='rk4')
+    template.build_lattice(1)
+    member = us.EnsembleMember(seed=3, dt=0.2, coupling_scale=1.5, phase_jitter=1.0)
+    ensemble = us.UniverseEnsemble(template, [member])
+    ensemble.run(100)
+
+    single = _lattice_run(3, 100, 0.2, 1.0, 1.5, integrator='rk4')
+    euler = _lattice_run(3, 100, 0.2, 1.0, 1.5)
+    assert _phase_gap(ensemble.phases[0], single._array_engine.phases) < 1e-9
+    assert _phase_gap(ensemble.phases[0], euler._array_engine.phases) > 1e-6
+
+    rk45 = us.UniverseSubstrate(seed=3, engine='array', integrator='rk45')
+    rk45.build_lattice(1)
+    with pytest.raises(ValueError):
+        us.UniverseEnsemble(rk45, [member])
+
+
+def _deck_universe(engine, **kwargs):
+    deck_state = us.find_deck_state()
+    if deck_state is None:
+        pytest.skip("deck_state.json not found")
+    universe = us.UniverseSubstrate(seed=5, engine=engine, **kwargs)
+    universe.load_from_deck_state(deck_state)
+    return universe
+
+
+def test_array_engine_matches_python_engine():
+    reference = _deck_universe('python')
+    fast = _deck_universe('array')
+    reference.run(300)
+    fast.run(300)
+    fast.sync_agents()
+
+    ids = list(reference.agents)
+    assert ids == list(fast.agents)
+    ref_phases = np.array([reference.agents[i].phase for i in ids])
+    fast_phases = np.array([fast.agents[i].phase for i in ids])
+    assert _phase_gap(ref_phases, fast_phases) < 1e-9
+    for i in ids:
+        assert reference.agents[i].interaction_count == fast.agents[i].interaction_count
+    for a, b in zip(reference.history, fast.history, strict=True):
+        assert a.cycle == b.cycle and a.cluster_count == b.cluster_count
+        assert a.order_parameter == pytest.approx(b.order_parameter, abs=1e-6)
+    assert ([(e['cycle'], e['type']) for e in reference.events]
+            == [(e['cycle'], e['type']) for e in fast.events])
+
+
+def test_checkpoint_resume_matches_uninterrupted_run(tmp_path, monkeypatch):
+    def universe(name):
+        u = _deck_universe('array', integrator='rk45')
+        u.jitter_phases(0.5)
+        u.open_stream(str(tmp_path / f'{name}.ums'), chunk_size=16)
+        return u
+
+    full = universe('full')
+    full.run(300, checkpoint_every=100, checkpoint_path=str(tmp_path / 'full.ckpt'))
+    full.close_stream()
+
+    # Die at cycle 250, after the cycle-200 checkpoint and some streamed chunks
+    interrupted = universe('resumed')
+    step = us.UniverseSubstrate.step
+
+    def crashing_step(self, *args, **kwargs):
+        if self is interrupted and self.cycle == 250:
+            raise KeyboardInterrupt
+        return step(self, *args, **kwargs)
+
+    monkeypatch.setattr(us.UniverseSubstrate, 'step', crashing_step)
+    checkpoint = str(tmp_path / 'resumed.ckpt')
+    with pytest.raises(KeyboardInterrupt):
+        interrupted.run(300, checkpoint_every=100, checkpoint_path=checkpoint)
+    interrupted.stream._file.close()
+    assert len(us.read_metrics_stream(str(tmp_path / 'resumed.ums'))['cycle']) > 200
+
+    resumed = us.UniverseSubstrate.load_checkpoint(checkpoint)
+    assert resumed.cycle == 200
+    resumed.run(100)
+    resumed.close_stream()
+
+    assert resumed.cycle == full.cycle
+    assert np.array_equal(resumed._array_engine.phases, full._array_engine.phases)
+    assert resumed.rng.getstate() == full.rng.getstate()
+    assert resumed.history == full.history
+    expected = us.read_metrics_stream(str(tmp_path / 'full.ums'))
+    actual = us.read_metrics_stream(str(tmp_path / 'resumed.ums'))
+    assert actual.keys() == expected.keys()
+    for name in expected:
+        assert actual[name] == expected[name], name